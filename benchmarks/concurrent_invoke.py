@@ -0,0 +1,52 @@
+"""Measures how /invoke latency scales with the number of parallel calls.
+
+Deploy a function first (e.g. with examples/deploy_and_run.py), then run:
+
+    python benchmarks/concurrent_invoke.py --function calculator --parallel 1 4 16
+
+For each level of parallelism the script fires that many /invoke calls at
+once and reports the wall-clock time of the whole batch next to the time
+of a single call. A non-blocking orchestrator keeps the ratio close to 1x
+until the cluster itself runs out of capacity.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+API_BASE_URL = "http://127.0.0.1:8000/api/v1"
+
+
+async def invoke_once(http: httpx.AsyncClient, function_name: str, payload: dict) -> float:
+    """Invokes the function once and returns the call's latency in seconds."""
+    started = time.perf_counter()
+    response = await http.post(f"{API_BASE_URL}/functions/{function_name}/invoke", json={"payload": payload})
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run_benchmark(function_name: str, levels: list, payload: dict) -> None:
+    """Runs one single-call baseline and then one batch per parallelism level."""
+    async with httpx.AsyncClient(timeout=None) as http:
+        baseline = await invoke_once(http, function_name, payload)
+        print(f"single call: {baseline:.2f}s")
+
+        for n in levels:
+            started = time.perf_counter()
+            latencies = await asyncio.gather(*(invoke_once(http, function_name, payload) for _ in range(n)))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{n:>4} parallel: {elapsed:.2f}s total, "
+                f"slowest call {max(latencies):.2f}s, "
+                f"{elapsed / baseline:.1f}x a single call"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--function", default="calculator", help="Name of a deployed function.")
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 4, 16], help="Parallelism levels.")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.function, args.parallel, {"operation": "sum", "numbers": [1, 2, 3]}))
@@ -0,0 +1,169 @@
+"""End-to-end latency and throughput benchmark of deploy and invoke.
+
+Runs the whole API in process against a scratch database and drives it
+through HTTP at a fixed concurrency: first deploying a set of functions,
+then invoking them. By default functions run on a fake executor that
+answers immediately (or after --handler-ms), so the numbers measure the
+platform's own hot path: routing, validation, metadata lookup, caching,
+dispatch and instrumentation. Use --executor local to include real worker
+processes.
+
+    python -m benchmarks.end_to_end --requests 20000 --concurrency 64
+    python -m benchmarks.end_to_end --executor local --max-p99-ms 5
+
+Run it from the repository root, so that the radical_faas package is importable.
+
+The script reports p50/p95/p99 latency and throughput for both stages,
+and the mean time spent in each invocation phase. With --max-p99-ms it
+exits with an error when the invoke p99 regresses past the given bound.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+from radical_faas import metrics
+from radical_faas.api.server import app
+from radical_faas.config import settings
+from radical_faas.controller import executors
+from radical_faas.controller.executors.base import Executor
+from radical_faas.runtime import builder
+
+CODE = '''
+def handle(payload):
+    return {"echo": payload}
+'''
+
+
+class FakeExecutor(Executor):
+    """Answers invocations in process, optionally after a fixed handler time."""
+
+    name = "fake"
+
+    def __init__(self, handler_seconds: float):
+        super().__init__()
+        self.handler_seconds = handler_seconds
+
+    async def prepare(self, function_data) -> str:
+        return f"fake://{function_data.name}@{builder.function_image_digest(function_data)[:16]}"
+
+    async def invoke(self, function_details: Dict[str, Any], payload: Any) -> Any:
+        with metrics.span("handler"):
+            if self.handler_seconds:
+                await asyncio.sleep(self.handler_seconds)
+        return {"echo": payload}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Returns the pct-th percentile of a sorted list of samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def report(stage: str, latencies: List[float], elapsed: float) -> float:
+    """Prints a latency summary in milliseconds and returns the p99."""
+    latencies.sort()
+    p99 = percentile(latencies, 99)
+    print(
+        f"{stage:>7}: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f}/s), "
+        f"p50 {percentile(latencies, 50):.2f}ms, p95 {percentile(latencies, 95):.2f}ms, "
+        f"p99 {p99:.2f}ms, mean {statistics.mean(latencies):.2f}ms"
+    )
+    return p99
+
+
+async def run_concurrently(count: int, concurrency: int, call) -> tuple:
+    """Runs call(i) for i in range(count) on a fixed number of concurrent clients."""
+    latencies = []
+    next_index = iter(range(count))
+
+    async def client() -> None:
+        for i in next_index:
+            started = time.perf_counter()
+            await call(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> float:
+    """Deploys the functions, invokes them, and returns the invoke p99 in milliseconds."""
+    phases: Dict[str, List[float]] = defaultdict(list)
+
+    async def deploy(http: httpx.AsyncClient, i: int) -> None:
+        spec = {
+            "name": f"bench-{i}", "runtime": "python:3.11-slim", "handler": "main.handle", "code": CODE,
+            "pool_size": args.pool_size, "pool_min_size": 1 if args.executor == "local" else 0,
+            "cacheable": args.cacheable,
+        }
+        (await http.post("/functions", json=spec)).raise_for_status()
+        status = (await http.get(f"/functions/bench-{i}/deployment", params={"wait": 60})).json()
+        if status["status"] != "ready":
+            raise RuntimeError(f"Deploying bench-{i} failed: {status.get('error')}")
+
+    async def invoke(http: httpx.AsyncClient, i: int) -> None:
+        # Payloads repeat every --distinct-payloads calls, so cacheable runs see hits.
+        payload = {"n": i % args.distinct_payloads}
+        response = await http.post(
+            f"/functions/bench-{i % args.functions}/invoke", json={"payload": payload}, params={"timings": "true"}
+        )
+        response.raise_for_status()
+        for phase, ms in response.json()["details"]["timings_ms"].items():
+            phases[phase].append(ms)
+
+    async with app.router.lifespan_context(app):
+        if args.executor == "fake":
+            executors.register_executor(FakeExecutor(args.handler_ms / 1000))
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=None)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1", limits=limits) as http:
+            # The platform logs every call; keep that out of the report.
+            with contextlib.redirect_stdout(io.StringIO()):
+                deploy_latencies, deploy_elapsed = await run_concurrently(
+                    args.functions, args.concurrency, lambda i: deploy(http, i)
+                )
+                await run_concurrently(min(args.requests, 1000), args.concurrency, lambda i: invoke(http, i))
+                phases.clear()
+                invoke_latencies, invoke_elapsed = await run_concurrently(
+                    args.requests, args.concurrency, lambda i: invoke(http, i)
+                )
+
+    print(f"executor={args.executor} functions={args.functions} concurrency={args.concurrency}")
+    report("deploy", deploy_latencies, deploy_elapsed)
+    p99 = report("invoke", invoke_latencies, invoke_elapsed)
+    for phase, samples in sorted(phases.items(), key=lambda item: -statistics.mean(item[1])):
+        print(f"{'':>9}{phase:<18} mean {statistics.mean(samples):.3f}ms over {len(samples)} calls")
+    return p99
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--executor", choices=["fake", "local"], default="fake", help="Backend to run functions on.")
+    parser.add_argument("--functions", type=int, default=10, help="Number of functions to deploy.")
+    parser.add_argument("--requests", type=int, default=10000, help="Number of invocations.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent clients.")
+    parser.add_argument("--handler-ms", type=float, default=0, help="Handler time of the fake executor.")
+    parser.add_argument("--pool-size", type=int, default=0, help="Warm pool size of each function.")
+    parser.add_argument("--cacheable", action="store_true", help="Deploy the functions as cacheable.")
+    parser.add_argument("--distinct-payloads", type=int, default=1000, help="Number of distinct payloads.")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if the invoke p99 exceeds this.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.db_file = os.path.join(tmp, "benchmark.db")
+        settings.local_functions_dir = os.path.join(tmp, "functions")
+        settings.default_executor = args.executor
+        p99 = asyncio.run(main(args))
+
+    if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+        sys.exit(f"Invoke p99 of {p99:.2f}ms exceeds the {args.max_p99_ms:.2f}ms bound.")
@@ -0,0 +1,83 @@
+"""Micro-benchmark of invoke-path metadata lookups.
+
+Drives store.metadata.get_function_details at a fixed request rate against
+a scratch SQLite database and reports the achieved rate and the lookup
+latency distribution, with and without the read-through cache:
+
+    python -m benchmarks.metadata_lookup --rate 10000 --seconds 5
+
+Run it from the repository root, so that the radical_faas package is importable.
+
+The whole run happens on one event loop, like the API server, so a lookup
+that blocked the loop would show up as missed rate and inflated tail
+latency for every other lookup.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from radical_faas.config import settings
+from radical_faas.store import metadata
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Returns the pct-th percentile of a sorted list of samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+async def drive(rate: int, seconds: float, functions: int, cached: bool) -> None:
+    """Issues lookups at a fixed rate and prints the latency distribution."""
+    latencies = []
+
+    async def lookup(name: str) -> None:
+        if not cached:
+            metadata.invalidate_function_cache(name)
+        started = time.perf_counter()
+        await metadata.get_function_details(name)
+        latencies.append((time.perf_counter() - started) * 1e6)
+
+    tasks = []
+    interval = 1 / rate
+    started = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        # Schedule lookups on the fixed timeline, catching up if we fell behind.
+        delay = started + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(lookup(f"function-{random.randrange(functions)}")))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{'cached' if cached else 'uncached':>9}: {len(latencies) / elapsed:,.0f} lookups/s, "
+        f"p50 {percentile(latencies, 50):.0f}us, p95 {percentile(latencies, 95):.0f}us, "
+        f"p99 {percentile(latencies, 99):.0f}us, mean {statistics.mean(latencies):.0f}us"
+    )
+
+
+async def main(rate: int, seconds: float, functions: int) -> None:
+    """Creates a scratch database with a set of functions and benchmarks lookups on it."""
+    for i in range(functions):
+        await metadata.save_function_details(
+            name=f"function-{i}", image_uri=f"registry/function-{i}:0", handler="main.handle", runtime="python:3.9-slim"
+        )
+    await drive(rate, seconds, functions, cached=False)
+    await drive(rate, seconds, functions, cached=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=10000, help="Target lookups per second.")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of each run.")
+    parser.add_argument("--functions", type=int, default=100, help="Number of distinct functions.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.db_file = os.path.join(tmp, "benchmark.db")
+        metadata.init_db()
+        asyncio.run(main(args.rate, args.seconds, args.functions))
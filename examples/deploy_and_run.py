@@ -1,7 +1,6 @@
 """An example client script to deploy and invoke a function on RADICAL-FaaS."""
 import requests
 import json
-import time
 
 API_BASE_URL = "http://127.0.0.1:8000/api/v1"
 
@@ -25,8 +24,19 @@ def deploy_calculator_function():
         response.raise_for_status()
         print("Deployment request successful:")
         print(json.dumps(response.json(), indent=2))
-        # Give the builder some time to build the image
-        time.sleep(15) 
+
+        # Long-poll the deployment status until the build has finished
+        deployment = {"status": "queued"}
+        while deployment["status"] in ("queued", "building"):
+            response = requests.get(
+                f"{API_BASE_URL}/functions/calculator/deployment", params={"wait": 30}
+            )
+            response.raise_for_status()
+            deployment = response.json()
+        print(f"Deployment finished with status '{deployment['status']}'.")
+        if deployment["status"] != "ready":
+            print(f"Build error: {deployment['error']}")
+            exit(1)
     except requests.exceptions.RequestException as e:
         print(f"Error deploying function: {e}")
         exit(1)
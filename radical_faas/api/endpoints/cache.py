@@ -0,0 +1,22 @@
+"""
+this module creates a router that reports on the result cache used by
+cacheable functions
+"""
+
+from fastapi import APIRouter
+
+from ...controller.result_cache import cache
+from .. import schemas
+
+# create a new router instance to help organize endpoints
+router = APIRouter()
+
+
+@router.get(
+    "/cache",
+    response_model=schemas.CacheStats,
+    summary="Get Result Cache Statistics"
+)
+async def get_cache_stats():
+    """Returns the result cache's hit, miss and eviction counters."""
+    return cache.stats()
@@ -3,10 +3,17 @@ this module creates a router that handles all api requests related to
 deploying, listing, and invoking functions
 """
 
-from fastapi import APIRouter, HTTPException, status
+import json
+from typing import Any, AsyncIterator, List
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 # import 'orchestrator' module directly from the 'controller' package
-from ...controller import orchestrator
+from ...controller import deployer, orchestrator
+from ...config import settings
+from ...store import metadata
 from .. import schemas
 
 # create a new router instance to help organize endpoints
@@ -20,13 +27,13 @@ router = APIRouter()
     summary="Deploy a New Function"
 )
 async def deploy_function(function_data: schemas.FunctionCreate):
-    """Accepts a request to deploy a new function."""
+    """Queues a function for deployment and returns without waiting for the build."""
     try:
-        # call the function directly from the imported orchestrator module
-        await orchestrator.deploy_new_function(function_data)
+        build = await deployer.submit_deployment(function_data)
         return schemas.FunctionResponse(
             status="success",
-            message=f"Deployment process for '{function_data.name}' has been initiated."
+            message=f"Deployment process for '{function_data.name}' has been initiated.",
+            details=schemas.DeploymentStatus.from_build(build).model_dump()
         )
     except Exception as e:
         raise HTTPException(
@@ -35,18 +42,77 @@ async def deploy_function(function_data: schemas.FunctionCreate):
         )
 
 
+@router.get(
+    "/functions/{function_name}",
+    response_model=schemas.FunctionResponse,
+    summary="Get a Function"
+)
+async def get_function(function_name: str):
+    """Returns a function's deployed details and the state of its latest deployment."""
+    function_details = await metadata.get_function_details(function_name)
+    build = await metadata.get_latest_build(function_name)
+    if function_details is None and build is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Function '{function_name}' not found."
+        )
+    return schemas.FunctionResponse(
+        status="success",
+        message=f"Details for function '{function_name}'.",
+        details={
+            "function": function_details,
+            "deployment": schemas.DeploymentStatus.from_build(build).model_dump() if build else None,
+        }
+    )
+
+
+@router.get(
+    "/functions/{function_name}/deployment",
+    response_model=schemas.DeploymentStatus,
+    summary="Get a Function's Deployment Status"
+)
+async def get_deployment_status(
+    function_name: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=settings.deployment_max_wait_seconds,
+        description="Seconds to long-poll for a queued or running build to finish."
+    ),
+):
+    """Returns the state of a function's latest deployment, optionally long-polling until it finishes."""
+    build = await deployer.wait_for_deployment(function_name, timeout=wait)
+    if build is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No deployment found for function '{function_name}'."
+        )
+    return schemas.DeploymentStatus.from_build(build)
+
+
 @router.post(
     "/functions/{function_name}/invoke",
     response_model=schemas.FunctionResponse,
     summary="Invoke a Deployed Function"
 )
-async def invoke_function(function_name: str, invoke_data: schemas.InvokeRequest):
+async def invoke_function(
+    function_name: str,
+    invoke_data: schemas.InvokeRequest,
+    timings: bool = Query(
+        False,
+        description="Return the result under 'result' in the details, alongside "
+                    "the milliseconds spent in each phase under 'timings_ms'."
+    ),
+):
     """Accepts a request to invoke a deployed function."""
+    phase_timings = {} if timings else None
     try:
         # call the function directly from the imported orchestrator module
         result_details = await orchestrator.schedule_and_run_function(
-            function_name, invoke_data.payload
+            function_name, invoke_data.payload, phase_timings
         )
+        if timings:
+            result_details = {"result": result_details, "timings_ms": phase_timings}
         return schemas.FunctionResponse(
             status="success",
             message=f"Function '{function_name}' invoked successfully.\n",
@@ -56,4 +122,86 @@ async def invoke_function(function_name: str, invoke_data: schemas.InvokeRequest
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to invoke function: {e}\n"
-        )
\ No newline at end of file
+        )
+
+
+def _validation_detail(e: ValidationError, *loc: Any) -> List[dict]:
+    """turns a validation error into a json-safe 422 detail, prefixing each error's location"""
+    errors = json.loads(e.json(include_url=False, include_input=False))
+    return [{**error, "loc": [*loc, *error["loc"]]} for error in errors]
+
+
+def _parse_ndjson_payloads(body: bytes) -> List[Any]:
+    """validates every InvokeRequest line of an NDJSON request body, failing with a 422 on the first bad one"""
+    payloads = []
+    for number, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            payloads.append(schemas.InvokeRequest.model_validate_json(line).payload)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=_validation_detail(e, "line", number)
+            )
+    return payloads
+
+
+async def _as_ndjson(results: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """serializes streamed batch results, ending the stream with an error line if the batch fails"""
+    try:
+        async for item in results:
+            yield json.dumps(item).encode() + b"\n"
+    except Exception as e:
+        yield schemas.BatchItemResult(status="error", error=str(e)).model_dump_json().encode() + b"\n"
+
+
+@router.post(
+    "/functions/{function_name}/invoke/batch",
+    response_class=StreamingResponse,
+    summary="Invoke a Deployed Function over Many Payloads",
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": schemas.BatchInvokeRequest.model_json_schema()},
+        "application/x-ndjson": {"schema": schemas.InvokeRequest.model_json_schema()},
+    }}},
+)
+async def invoke_function_batch(
+    function_name: str,
+    request: Request,
+    workers: int = Query(
+        settings.batch_default_workers,
+        ge=1,
+        le=settings.batch_max_workers,
+        description="Number of workers the payloads are spread over."
+    ),
+    order: str = Query(
+        "input",
+        pattern="^(input|completion)$",
+        description="Stream results in 'input' order or in 'completion' order."
+    ),
+):
+    """
+    Invokes a function over a list of payloads and streams back one NDJSON
+    result line per payload as they finish.
+
+    The body is either a BatchInvokeRequest JSON object or, with the
+    'application/x-ndjson' content type, one InvokeRequest per line.
+    """
+    # the body is read up front: reading it while the response streams would
+    # race the server's disconnect listener for the same ASGI messages
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        payloads = _parse_ndjson_payloads(body)
+    else:
+        try:
+            payloads = schemas.BatchInvokeRequest.model_validate_json(body).payloads
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=_validation_detail(e))
+
+    try:
+        results = await orchestrator.run_batch(
+            function_name, payloads, workers=workers, ordered=(order == "input")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return StreamingResponse(_as_ndjson(results), media_type="application/x-ndjson")
@@ -4,7 +4,7 @@ request and response bodies, ensuring that all data exchanged with the API
 is well-formed
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, Dict, Any, List
 
 
@@ -12,7 +12,11 @@ class FunctionCreate(BaseModel):
     """Schema for creating a new function."""
     name: str = Field(
         ...,
-        description="The unique name of the function.",
+        # a DNS-1123 label, short enough to stay valid with the suffixes of
+        # the Job, pod and image names derived from it
+        pattern="^[a-z0-9]([-a-z0-9]*[a-z0-9])?$",
+        max_length=49,
+        description="The unique name of the function: lowercase letters, digits and '-'.",
         example="my-greeting-function"
     )
     runtime: str = Field(
@@ -22,6 +26,7 @@ class FunctionCreate(BaseModel):
     )
     handler: str = Field(
         ...,
+        pattern="^[A-Za-z_][A-Za-z0-9_]*\\.[A-Za-z_][A-Za-z0-9_]*$",
         description="The entry point for the function (e.g., 'main.handle').",
         example="main.handle"
     )
@@ -34,6 +39,56 @@ class FunctionCreate(BaseModel):
         description="A list of pip-installable dependencies.",
         example=["requests", "numpy"]
     )
+    pool_size: int = Field(
+        default=0,
+        ge=0,
+        description="Maximum number of warm worker pods kept for the function. "
+                    "0 disables the warm pool and runs one Job per invocation.",
+        example=4
+    )
+    pool_min_size: int = Field(
+        default=0,
+        ge=0,
+        description="Number of warm workers kept alive even when idle. At most pool_size, when that is set.",
+        example=1
+    )
+    executor: Optional[str] = Field(
+        default=None,
+        pattern="^(kubernetes|local)$",
+        description="Where the function runs: 'kubernetes' or 'local' worker processes. "
+                    "Defaults to the platform's configured executor.",
+        example="local"
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds a single invocation may run before it is killed.",
+        example=30
+    )
+    memory_limit_mb: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Memory limit for each worker running the function, in MiB.",
+        example=256
+    )
+    cacheable: bool = Field(
+        default=False,
+        description="Whether the function is pure, so that results for identical payloads can be reused.",
+        example=True
+    )
+    cache_ttl_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="How long a cached result is reused. Defaults to the platform's result cache TTL.",
+        example=60
+    )
+
+    @model_validator(mode="after")
+    def check_pool_sizes(self) -> "FunctionCreate":
+        """Rejects a minimum pool size the pool could never reach."""
+        if self.pool_size and self.pool_min_size > self.pool_size:
+            raise ValueError("pool_min_size cannot exceed pool_size.")
+        return self
 
     class Config:
         """Pydantic configuration."""
@@ -48,8 +103,61 @@ class InvokeRequest(BaseModel):
     )
 
 
+class BatchInvokeRequest(BaseModel):
+    """Schema for a batch invocation request."""
+    payloads: List[Dict[str, Any]] = Field(
+        ...,
+        description="The JSON-serializable inputs, one per invocation.",
+        example=[{"operation": "sum", "numbers": [1, 2]}, {"operation": "sum", "numbers": [3, 4]}]
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Schema for one line of a streamed batch response."""
+    index: Optional[int] = Field(
+        default=None,
+        description="Position of the payload in the request. Absent for errors that end the batch."
+    )
+    status: str = Field(description="'success' or 'error'.", example="success")
+    result: Optional[Any] = Field(default=None, description="The function's result.")
+    error: Optional[str] = Field(default=None, description="Why this item failed.")
+
+
 class FunctionResponse(BaseModel):
     """A standardized response schema for function-related operations."""
     status: str = Field(description="The status of the operation.", example="success")
     message: str = Field(description="A descriptive message.", example="Function deployed successfully.")
-    details: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    details: Optional[Dict[str, Any]] = None
+
+
+class DeploymentStatus(BaseModel):
+    """The state of a function's most recent deployment."""
+    build_id: int = Field(description="The ID of the build.", example=42)
+    function_name: str = Field(description="The name of the function being deployed.")
+    status: str = Field(
+        description="One of 'queued', 'building', 'ready' or 'failed'.",
+        example="building"
+    )
+    image_uri: Optional[str] = Field(default=None, description="The built image, once ready.")
+    error: Optional[str] = Field(default=None, description="The failure reason, if the build failed.")
+    queued_at: float = Field(description="When the deploy was queued (Unix time).")
+    started_at: Optional[float] = Field(default=None, description="When the build started (Unix time).")
+    finished_at: Optional[float] = Field(default=None, description="When the build finished (Unix time).")
+    duration_seconds: Optional[float] = Field(default=None, description="How long the build took.")
+
+    @classmethod
+    def from_build(cls, build: Dict[str, Any]) -> "DeploymentStatus":
+        """Creates a status from a build record in the metadata store."""
+        return cls(build_id=build["id"], **{k: v for k, v in build.items() if k not in ("id", "spec")})
+
+
+class CacheStats(BaseModel):
+    """Counters for the result cache of cacheable functions."""
+    entries: int = Field(description="Number of results currently held in memory.")
+    max_entries: int = Field(description="Number of results held before the least recently used is evicted.")
+    hits: int = Field(description="Requests served from memory.")
+    misses: int = Field(description="Requests that found no fresh result in memory.")
+    coalesced: int = Field(description="Requests that waited on an identical request already running.")
+    spill_hits: int = Field(description="Misses served from results spilled to the metadata store.")
+    evictions: int = Field(description="Results evicted from memory.")
+    hit_ratio: float = Field(description="Share of requests that did not run the function.", example=0.9)
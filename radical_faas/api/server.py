@@ -5,17 +5,43 @@ this module creates the fastapi app instance and includes the routers
 for different parts of the api
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from .endpoints import functions
+from fastapi.responses import PlainTextResponse
+from .endpoints import cache, functions
+from ..controller import deployer, executors
+from .. import metrics
+from ..store import metadata
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """starts the background build workers and store writer, and stops warm workers on exit"""
+    metadata.init_db()
+    await metadata.start_writer()
+    await deployer.start()
+    yield
+    await deployer.stop()
+    await executors.shutdown_all()
+    await metadata.stop_writer()
+
 
 # create fastapi app instance
-app = FastAPI(title="RADICAL-FaaS")
+app = FastAPI(title="RADICAL-FaaS", lifespan=lifespan)
 
 # include router from the 'functions' endpoint module, all routes defined in that router will be added to the app
 app.include_router(functions.router, prefix="/api/v1", tags=["Functions"])
+app.include_router(cache.router, prefix="/api/v1", tags=["Cache"])
 
 
 @app.get("/", tags=["Health Check"])
 async def read_root():
     """health check endpoint to confirm the API is running"""
-    return {"status": "RADICAL-FaaS API is running"}
\ No newline at end of file
+    return {"status": "RADICAL-FaaS API is running"}
+
+
+@app.get("/metrics", tags=["Monitoring"], response_class=PlainTextResponse)
+async def read_metrics():
+    """exposes invocation, phase timing and cache metrics in the prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
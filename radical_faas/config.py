@@ -0,0 +1,80 @@
+"""
+Manages centralized configuration for the RADICAL-FaaS application.
+
+This module provides a single source of truth for application settings,
+making it easy to manage configuration for different environments.
+"""
+
+import os
+
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """Defines the application settings using Pydantic."""
+    # Store settings
+    db_file: str = "radical_faas.db"
+    # Threads serving read queries; writes always go through a single thread.
+    db_read_workers: int = 4
+    db_busy_timeout_seconds: float = 5.0
+    # Invocation records are written once this many are buffered, or every
+    # flush interval, whichever comes first.
+    db_write_batch_size: int = 500
+    db_flush_interval_seconds: float = 1.0
+
+    # Executor that functions run on unless their deploy request says otherwise:
+    # "kubernetes" or "local".
+    default_executor: str = "kubernetes"
+
+    # Local executor settings
+    # Where function code is written for local worker processes.
+    local_functions_dir: str = ".radical_functions"
+    # Maximum number of worker processes per function when its pool_size is 0.
+    local_pool_size: int = os.cpu_count() or 1
+
+    # Builder settings
+    # The default registry where function images will be pushed.
+    # Replace this with your own Docker Hub username or private registry.
+    container_registry: str = "docker.io/your-username"
+    # Number of digest characters used in image tags.
+    image_tag_length: int = 16
+    # Number of deployments built concurrently.
+    build_workers: int = 2
+    # Upper bound for long-polling a deployment's status.
+    deployment_max_wait_seconds: int = 60
+
+    # Kubernetes settings
+    job_namespace: str = "default"
+    job_ttl_seconds_after_finished: int = 600 # 10 minutes
+    job_timeout_seconds: int = 120
+    # Size of the thread pool (and HTTP connection pool) for Kubernetes API calls.
+    kube_api_max_workers: int = 32
+
+    # Worker settings
+    # Port the wrapper listens on inside function containers.
+    worker_port: int = 8080
+    worker_startup_timeout_seconds: int = 120
+    # "socket" talks to containers with the framed protocol; "logs" falls back
+    # to passing the payload in an env var and scraping the result from the
+    # pod logs, for setups where the API server cannot reach pod IPs.
+    job_transport: str = "socket"
+
+    # Batch invocation settings
+    # Number of workers (Jobs or pool lanes) a batch is spread over by default.
+    batch_default_workers: int = 4
+    batch_max_workers: int = 64
+
+    # Result cache settings, for functions deployed as cacheable
+    # Maximum number of results kept in memory before the least recently used is evicted.
+    result_cache_max_entries: int = 10000
+    # How long a result stays fresh unless the function sets its own TTL.
+    result_cache_ttl_seconds: float = 300.0
+    # Write evicted results to the metadata store instead of dropping them.
+    result_cache_spill: bool = False
+
+    # Warm pool settings
+    # Idle workers above a function's minimum pool size are evicted after this long.
+    pool_idle_timeout_seconds: int = 300
+
+# Create a single, importable instance of the settings
+settings = Settings()
\ No newline at end of file
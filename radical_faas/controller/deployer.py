@@ -0,0 +1,129 @@
+"""
+Background deployment pipeline for RADICAL-FaaS.
+
+Deploy requests are written to a persistent build queue in the metadata
+store and answered immediately. A configurable pool of build workers
+drains the queue, running one build per function at a time, and records
+each build's state (queued / building / ready / failed) and duration so
+that clients can poll or long-poll a function's deployment status.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from . import orchestrator
+from .. import metrics
+from ..api import schemas
+from ..config import settings
+from ..store import metadata
+
+TERMINAL_STATES = (metadata.BUILD_READY, metadata.BUILD_FAILED)
+
+_queue: "asyncio.Queue[int]" = asyncio.Queue()
+_workers: List[asyncio.Task] = []
+# Builds of the same function never run concurrently.
+_function_locks: Dict[str, asyncio.Lock] = {}
+# Set when a build reaches a terminal state, to wake long-polling clients.
+_finished: Dict[int, asyncio.Event] = {}
+
+
+async def start() -> None:
+    """Starts the build workers and re-queues builds left over from a previous run."""
+    for build_id in await metadata.requeue_unfinished_builds():
+        _queue.put_nowait(build_id)
+    for i in range(settings.build_workers):
+        _workers.append(asyncio.create_task(_build_worker(i)))
+    print(f"Deployer: Started {settings.build_workers} build workers.")
+
+
+async def stop() -> None:
+    """Cancels the build workers. Interrupted builds are retried on the next start."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+async def submit_deployment(function_data: schemas.FunctionCreate) -> Dict[str, Any]:
+    """
+    Queues a deployment and returns without waiting for the build.
+
+    Returns:
+        The queued build record.
+    """
+    build_id, queued = await metadata.enqueue_build(function_data.name, function_data.model_dump_json())
+    if queued:
+        _queue.put_nowait(build_id)
+        print(f"Deployer: Queued build {build_id} for '{function_data.name}'.")
+    else:
+        print(f"Deployer: Merged deploy of '{function_data.name}' into queued build {build_id}.")
+    return await metadata.get_build(build_id)
+
+
+async def wait_for_deployment(function_name: str, timeout: float = 0) -> Optional[Dict[str, Any]]:
+    """
+    Returns a function's latest build, optionally waiting for it to finish.
+
+    Args:
+        function_name: The name of the function.
+        timeout: Seconds to wait for a queued or running build to reach
+            'ready' or 'failed'. 0 returns the current state immediately.
+
+    Returns:
+        The build record, or None if the function was never deployed.
+    """
+    build = await metadata.get_latest_build(function_name)
+    if build is None or build["status"] in TERMINAL_STATES or timeout <= 0:
+        return build
+
+    event = _finished.setdefault(build["id"], asyncio.Event())
+    # The build may have finished while the event was being registered.
+    build = await metadata.get_build(build["id"])
+    if build["status"] in TERMINAL_STATES:
+        _finished.pop(build["id"], None)
+        return build
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return await metadata.get_build(build["id"])
+
+
+async def _build_worker(worker_id: int) -> None:
+    """Takes builds off the queue and runs them until cancelled."""
+    while True:
+        build_id = await _queue.get()
+        try:
+            await _run_build(build_id)
+        except Exception as e:
+            print(f"Deployer: Worker {worker_id} failed to process build {build_id}: {e}")
+        finally:
+            _queue.task_done()
+
+
+async def _run_build(build_id: int) -> None:
+    """Runs a single queued build and records its outcome."""
+    build = await metadata.get_build(build_id)
+    if build is None:
+        return
+    lock = _function_locks.setdefault(build["function_name"], asyncio.Lock())
+    async with lock:
+        build = await metadata.claim_build(build_id)
+        if build is None:
+            return
+
+        print(f"Deployer: Building '{build['function_name']}' (build {build_id}).")
+        try:
+            function_data = schemas.FunctionCreate.model_validate_json(build["spec"])
+            with metrics.track(function_data.name):
+                image_uri = await orchestrator.deploy_new_function(function_data)
+        except Exception as e:
+            await metadata.finish_build(build_id, error=str(e))
+            print(f"Deployer: Build {build_id} failed: {e}")
+        else:
+            await metadata.finish_build(build_id, image_uri=image_uri)
+            print(f"Deployer: Build {build_id} is ready.")
+
+    event = _finished.pop(build_id, None)
+    if event is not None:
+        event.set()
@@ -0,0 +1,54 @@
+"""
+Pluggable execution backends for deployed functions.
+
+Each function is deployed onto one executor, recorded in its metadata,
+and every invocation of the function is dispatched through that
+executor. Executors are created on first use, so a backend's setup cost
+(such as loading Kubernetes credentials) is only paid when a function
+actually runs on it.
+"""
+
+from typing import Dict
+
+from .base import Executor, LaneLost
+
+_executors: Dict[str, Executor] = {}
+
+
+def get_executor(name: str) -> Executor:
+    """
+    Returns the executor registered under a name, creating it on first use.
+
+    Raises:
+        ValueError: If no executor with that name exists.
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        if name == "kubernetes":
+            from .kubernetes import KubernetesExecutor
+            executor = KubernetesExecutor()
+        elif name == "local":
+            from .local import LocalExecutor
+            executor = LocalExecutor()
+        else:
+            raise ValueError(f"Unknown executor '{name}'.")
+        _executors[name] = executor
+    return executor
+
+
+def register_executor(executor: Executor) -> None:
+    """Makes an executor available under its name, such as a stand-in backend for benchmarks."""
+    _executors[executor.name] = executor
+
+
+async def release_everywhere(function_name: str) -> None:
+    """Drops a function's warm workers from every executor that has been started."""
+    for executor in _executors.values():
+        await executor.release(function_name)
+
+
+async def shutdown_all() -> None:
+    """Shuts down every executor that has been started."""
+    for executor in _executors.values():
+        await executor.shutdown()
+    _executors.clear()
@@ -0,0 +1,107 @@
+"""
+The interface every execution backend implements.
+"""
+
+import functools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from ..pool import FunctionPool, PoolClosedError
+from ...api import schemas
+from ...config import settings
+from ...store import metadata
+
+
+class LaneLost(RuntimeError):
+    """Raised by a batch lane when the worker dedicated to it is gone, so that it can run no further payloads."""
+
+
+def invocation_timeout(function_details: Dict[str, Any]) -> float:
+    """Returns the seconds one invocation may run: the function's own timeout, or the platform default."""
+    return function_details.get("timeout_seconds") or settings.job_timeout_seconds
+
+
+class Executor:
+    """
+    Runs invocations of deployed functions on one execution backend.
+
+    Subclasses prepare a function's runnable artifact at deploy time and
+    say how to build a warm pool for it. The base class keeps one pool per
+    function and routes invocations through it.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self._pools: Dict[str, FunctionPool] = {}
+
+    async def prepare(self, function_data: schemas.FunctionCreate) -> str:
+        """
+        Turns a function's source into something the backend can run.
+
+        Returns:
+            A URI identifying the prepared artifact, which changes whenever
+            the function's code, handler, runtime or dependencies change.
+        """
+        raise NotImplementedError
+
+    async def invoke(self, function_details: Dict[str, Any], payload: Any) -> Any:
+        """Runs one invocation and returns the handler's result."""
+        pool = await self.get_pool(function_details)
+        try:
+            return await pool.invoke(payload)
+        except PoolClosedError:
+            # The function was redeployed while this call was queued; run it
+            # the way the new deployment runs, which may no longer be a pool.
+            current = await metadata.get_function_details(function_details["name"])
+            if current is None or current["executor"] != self.name:
+                raise
+            return await self.invoke(current, payload)
+
+    @asynccontextmanager
+    async def lane(self, function_details: Dict[str, Any]) -> AsyncIterator[Callable[[Any], Awaitable[Any]]]:
+        """
+        Provides an invoke callable for running many payloads of a batch in sequence.
+
+        Backends that can dedicate a worker to a batch override this; by
+        default a lane shares the function's warm pool. A dedicated lane
+        raises LaneLost once its worker is gone. Any other exception fails
+        only the payload being run, and the lane goes on to the next one.
+        """
+        yield functools.partial(self.invoke, function_details)
+
+    def uses_pool(self, function_details: Dict[str, Any]) -> bool:
+        """Whether invocations of a function run on its warm pool."""
+        return True
+
+    async def warm(self, function_details: Dict[str, Any]) -> None:
+        """Starts a function's pool so that its minimum number of workers is ready."""
+        await self.get_pool(function_details)
+
+    async def get_pool(self, function_details: Dict[str, Any]) -> FunctionPool:
+        """Returns the warm pool for a function, creating it on first use."""
+        name = function_details["name"]
+        pool = self._pools.get(name)
+        if pool is None:
+            created = await self._create_pool(function_details)
+            # Another invocation may have created the pool in the meantime.
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = created
+                await pool.start()
+        return pool
+
+    async def _create_pool(self, function_details: Dict[str, Any]) -> FunctionPool:
+        """Builds, but does not start, the warm pool for a function."""
+        raise NotImplementedError
+
+    async def release(self, function_name: str) -> None:
+        """Shuts down a function's warm pool so that stale workers are not reused."""
+        pool = self._pools.pop(function_name, None)
+        if pool is not None:
+            await pool.shutdown()
+
+    async def shutdown(self) -> None:
+        """Shuts down every pool owned by the executor."""
+        for name in list(self._pools):
+            await self.release(name)
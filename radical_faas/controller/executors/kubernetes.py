@@ -0,0 +1,264 @@
+"""
+Runs functions on Kubernetes.
+
+Functions with a warm pool are served by long-lived worker pods. All
+other invocations run as one-off Jobs whose container serves a single
+invocation over the framed protocol and then exits, or, with
+job_transport="logs", reads its payload from the environment and prints
+the result to its log.
+"""
+
+import asyncio
+import functools
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+
+from kubernetes import client
+
+from .base import Executor, LaneLost, invocation_timeout
+from .. import kube
+from ..pool import FunctionPool
+from ..worker import Worker
+from ... import metrics
+from ...api import schemas
+from ...config import settings
+from ...runtime import builder, protocol
+
+
+def _container(function_details: Dict[str, Any], env: List[client.V1EnvVar], **kwargs) -> client.V1Container:
+    """Builds the container spec shared by worker pods and Jobs."""
+    resources = None
+    if function_details.get("memory_limit_mb"):
+        memory = f"{function_details['memory_limit_mb']}Mi"
+        resources = client.V1ResourceRequirements(limits={"memory": memory})
+    return client.V1Container(
+        name=function_details["name"],
+        image=function_details["image_uri"],
+        env=env + [client.V1EnvVar(name="RADICAL_HANDLER", value=function_details["handler"])],
+        resources=resources,
+        image_pull_policy="IfNotPresent", # Important for local development
+        **kwargs
+    )
+
+
+class PodPool(FunctionPool):
+    """A warm pool whose workers are long-lived pods."""
+
+    def __init__(self, function_details: Dict[str, Any]):
+        super().__init__(
+            function_name=function_details["name"],
+            max_size=function_details["pool_size"],
+            min_size=function_details["pool_min_size"],
+            timeout=invocation_timeout(function_details),
+        )
+        self.function_details = function_details
+
+    async def _spawn(self, name: str) -> Worker:
+        """Creates a worker pod and connects to it once it is running."""
+        container = _container(
+            self.function_details,
+            [
+                client.V1EnvVar(name="RADICAL_MODE", value="serve"),
+                client.V1EnvVar(name="RADICAL_PORT", value=str(settings.worker_port)),
+            ],
+            ports=[client.V1ContainerPort(container_port=settings.worker_port)],
+        )
+        pod = client.V1Pod(
+            api_version="v1",
+            kind="Pod",
+            metadata=client.V1ObjectMeta(
+                name=name,
+                labels={
+                    kube.MANAGED_LABEL: "true",
+                    "radical-faas/function": self.function_name,
+                    "radical-faas/worker": name,
+                },
+            ),
+            spec=client.V1PodSpec(containers=[container], restart_policy="Never"),
+        )
+        with metrics.span("pod_create"):
+            await kube.call(
+                kube.core_v1_api().create_namespaced_pod, namespace=settings.job_namespace, body=pod
+            )
+
+        worker = Worker(name)
+        try:
+            await worker.connect(await kube.wait_for_pod_ip(name))
+        except Exception:
+            await self._delete_pod(name)
+            raise
+        return worker
+
+    async def _destroy(self, worker: Worker) -> None:
+        """Tells the worker to exit and deletes its pod."""
+        await worker.shutdown()
+        await self._delete_pod(worker.name)
+
+    async def _delete_pod(self, pod_name: str) -> None:
+        """Deletes a worker pod, ignoring pods that are already gone."""
+        try:
+            await kube.call(
+                kube.core_v1_api().delete_namespaced_pod,
+                name=pod_name, namespace=settings.job_namespace, grace_period_seconds=0
+            )
+        except client.ApiException as e:
+            if e.status != 404:
+                print(f"Pool: Failed to delete worker '{pod_name}': {e}")
+
+
+class KubernetesExecutor(Executor):
+    """Runs functions as Kubernetes Jobs, or on warm pools of worker pods."""
+
+    name = "kubernetes"
+
+    async def prepare(self, function_data: schemas.FunctionCreate) -> str:
+        """Builds the function's container image."""
+        return await builder.build_image_from_code(function_data)
+
+    async def invoke(self, function_details: Dict[str, Any], payload: Any) -> Any:
+        """Runs one invocation on the function's warm pool, or as a one-off Job."""
+        if self.uses_pool(function_details):
+            return await super().invoke(function_details, payload)
+        return await self._run_as_job(function_details, payload)
+
+    @asynccontextmanager
+    async def lane(self, function_details: Dict[str, Any]) -> AsyncIterator[Callable[[Any], Awaitable[Any]]]:
+        """Dedicates one serve-mode Job to a batch lane, unless the function is pooled."""
+        if self.uses_pool(function_details) or settings.job_transport == "logs":
+            yield functools.partial(self.invoke, function_details)
+            return
+
+        # The lane's Job runs many payloads, so it gets no Job-wide deadline;
+        # each payload is bounded instead, and a stuck one takes the Job down.
+        worker = await self._start_job_worker(function_details, deadline=False)
+        timeout = invocation_timeout(function_details)
+
+        async def invoke(payload: Any) -> Any:
+            try:
+                result, _ = await asyncio.wait_for(worker.invoke(payload), timeout)
+            except asyncio.TimeoutError:
+                await self._delete_job(worker.name)
+                raise LaneLost(f"Job '{worker.name}' timed out after {timeout}s.")
+            except (ConnectionError, OSError, protocol.ProtocolError) as e:
+                raise LaneLost(f"Job '{worker.name}' failed: {e}")
+            return result
+
+        try:
+            yield invoke
+        finally:
+            await worker.shutdown()
+
+    def uses_pool(self, function_details: Dict[str, Any]) -> bool:
+        """Only functions deployed with a pool_size run on warm pods; the others run as Jobs."""
+        return function_details["pool_size"] > 0
+
+    async def _create_pool(self, function_details: Dict[str, Any]) -> FunctionPool:
+        return PodPool(function_details)
+
+    async def _run_as_job(self, function_details: Dict[str, Any], payload: Any) -> Any:
+        """Runs a single invocation as a one-off Kubernetes Job."""
+        if settings.job_transport == "logs":
+            return await self._run_job_with_logs(function_details, payload)
+
+        worker = await self._start_job_worker(function_details)
+        try:
+            result, _ = await asyncio.wait_for(worker.invoke(payload), invocation_timeout(function_details))
+        except asyncio.TimeoutError:
+            await self._delete_job(worker.name)
+            raise TimeoutError(f"Job '{worker.name}' timed out.")
+        finally:
+            # The wrapper exits once told to shut down, which completes the Job.
+            await worker.shutdown()
+        print(f"Orchestrator: Job '{worker.name}' returned a result.")
+        return result
+
+    async def _start_job_worker(self, function_details: Dict[str, Any], deadline: bool = True) -> Worker:
+        """Submits a Job running the wrapper in serve mode and connects to it."""
+        job_name = await self._submit_job(function_details, [
+            client.V1EnvVar(name="RADICAL_MODE", value="serve"),
+            client.V1EnvVar(name="RADICAL_PORT", value=str(settings.worker_port)),
+        ], deadline)
+        worker = Worker(job_name)
+        try:
+            await worker.connect(await kube.wait_for_pod_ip(job_name))
+        except Exception:
+            await self._delete_job(job_name)
+            raise
+        return worker
+
+    async def _delete_job(self, job_name: str) -> None:
+        """Deletes a Job and its pod, logging rather than raising on failure."""
+        try:
+            await kube.call(
+                kube.batch_v1_api().delete_namespaced_job,
+                name=job_name, namespace=settings.job_namespace, propagation_policy="Background"
+            )
+        except client.ApiException as e:
+            print(f"Orchestrator: Failed to clean up Job '{job_name}': {e}")
+
+    async def _submit_job(
+        self, function_details: Dict[str, Any], env: List[client.V1EnvVar], deadline: bool = True
+    ) -> str:
+        """Creates a Job running the function's image and returns its name."""
+        job_name = f"{function_details['name']}-{uuid.uuid4().hex[:6]}"
+
+        pod_template = client.V1PodTemplateSpec(
+            metadata=client.V1ObjectMeta(labels={kube.MANAGED_LABEL: "true", "job-name": job_name}),
+            spec=client.V1PodSpec(containers=[_container(function_details, env)], restart_policy="Never"),
+        )
+        job = client.V1Job(
+            api_version="batch/v1",
+            kind="Job",
+            metadata=client.V1ObjectMeta(name=job_name, labels={kube.MANAGED_LABEL: "true"}),
+            spec=client.V1JobSpec(
+                template=pod_template,
+                backoff_limit=0,
+                ttl_seconds_after_finished=settings.job_ttl_seconds_after_finished,
+                active_deadline_seconds=_deadline(function_details) if deadline else None,
+            ),
+        )
+
+        with metrics.span("job_create"):
+            await kube.call(kube.batch_v1_api().create_namespaced_job, namespace=settings.job_namespace, body=job)
+        print(f"Orchestrator: Submitted Job '{job_name}'.")
+        return job_name
+
+    async def _run_job_with_logs(self, function_details: Dict[str, Any], payload: dict) -> Dict[str, Any]:
+        """Runs a Job in legacy mode and scrapes its result from the pod logs."""
+        job_name = await self._submit_job(function_details, [
+            client.V1EnvVar(name="RADICAL_MODE", value="legacy"),
+            client.V1EnvVar(name="RADICAL_PAYLOAD", value=json.dumps(payload)),
+        ])
+        print(f"Orchestrator: Monitoring Job '{job_name}' for completion...")
+
+        with metrics.span("job_wait"):
+            await kube.wait_for_job(job_name, _deadline(function_details))
+        print(f"Orchestrator: Job '{job_name}' succeeded.")
+
+        with metrics.span("result_retrieval"):
+            pod_list = await kube.call(
+                kube.core_v1_api().list_namespaced_pod,
+                namespace=settings.job_namespace,
+                label_selector=f"job-name={job_name}"
+            )
+            pod_name = pod_list.items[0].metadata.name
+            logs = await kube.call(
+                kube.core_v1_api().read_namespaced_pod_log,
+                name=pod_name,
+                namespace=settings.job_namespace
+            )
+        try:
+            result_str = logs.split("---RESULT_START---")[1].split("---RESULT_END---")[0]
+            result = json.loads(result_str.strip())
+        except (IndexError, json.JSONDecodeError) as e:
+            raise RuntimeError(f"Could not parse result from pod logs: {e}\nLogs: {logs}")
+        if "---HANDLER_MS:" in logs:
+            metrics.observe("handler", float(logs.split("---HANDLER_MS:")[1].split("---")[0]) / 1000)
+        return result
+
+
+def _deadline(function_details: Dict[str, Any]) -> int:
+    """Leaves a one-off Job enough time to start its pod before its handler times out."""
+    return int(invocation_timeout(function_details)) + settings.worker_startup_timeout_seconds
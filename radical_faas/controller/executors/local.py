@@ -0,0 +1,138 @@
+"""
+Runs functions in local worker processes, without Kubernetes.
+
+Each function gets a pool of pre-started Python processes running the
+wrapper in stdio mode, so the user's module is imported once per process
+and an invocation costs one frame exchange over a pipe. The function's
+stored code is written to a directory named after its content digest, so
+processes for a redeployed function never load stale code.
+
+Workers run in the server's own Python environment, so any dependencies
+a function declares must already be installed there. A worker whose
+handler exceeds the function's timeout is killed, and the function's
+memory limit is enforced as an address-space limit on the process.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict
+
+from .base import Executor, invocation_timeout
+from ..pool import FunctionPool
+from ..worker import Worker
+from ... import metrics
+from ...api import schemas
+from ...config import settings
+from ...runtime import builder
+
+
+def _function_dir(image_uri: str) -> str:
+    """Returns the directory holding a function's code, refusing any path outside local_functions_dir."""
+    root = os.path.realpath(settings.local_functions_dir)
+    path = os.path.realpath(os.path.join(root, image_uri[len("local://"):]))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"Invalid function directory for '{image_uri}'.")
+    return path
+
+
+def _materialize(function_details: Dict[str, Any]) -> str:
+    """Writes a function's module and the wrapper to its directory, if not already there."""
+    path = _function_dir(function_details["image_uri"])
+    if os.path.isdir(path):
+        return path
+
+    os.makedirs(settings.local_functions_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=settings.local_functions_dir)
+    try:
+        module_name, _ = function_details["handler"].split('.')
+        with open(os.path.join(staging, f"{module_name}.py"), "w") as f:
+            f.write(function_details["code"])
+        with open(os.path.join(staging, "wrapper.py"), "w") as f:
+            f.write(builder.WRAPPER_SCRIPT)
+        shutil.copy(builder.PROTOCOL_MODULE, os.path.join(staging, "radical_protocol.py"))
+        os.rename(staging, path)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        # Another deploy may have written the same directory first.
+        if not os.path.isdir(path):
+            raise
+    return path
+
+
+class ProcessWorker(Worker):
+    """A worker that speaks the protocol over the stdin and stdout of a local process."""
+
+    def __init__(self, name: str, process: asyncio.subprocess.Process):
+        super().__init__(name)
+        self.process = process
+        self.reader, self.writer = process.stdout, process.stdin
+
+    async def kill(self) -> None:
+        """Kills the process, which may be stuck in a handler, and waits for it to exit."""
+        if self.process.returncode is None:
+            self.process.kill()
+        await self.close()
+        await self.process.wait()
+
+
+class ProcessPool(FunctionPool):
+    """A warm pool whose workers are local Python processes."""
+
+    def __init__(self, function_details: Dict[str, Any], path: str):
+        super().__init__(
+            function_name=function_details["name"],
+            max_size=function_details["pool_size"] or settings.local_pool_size,
+            min_size=function_details["pool_min_size"],
+            timeout=invocation_timeout(function_details),
+        )
+        self.function_details = function_details
+        self.path = path
+
+    async def _spawn(self, name: str) -> ProcessWorker:
+        """Starts a wrapper process that speaks the protocol over its stdin and stdout."""
+        env = dict(
+            os.environ,
+            RADICAL_MODE="serve",
+            RADICAL_TRANSPORT="stdio",
+            RADICAL_HANDLER=self.function_details["handler"],
+        )
+        if self.function_details.get("memory_limit_mb"):
+            env["RADICAL_MEMORY_LIMIT_MB"] = str(self.function_details["memory_limit_mb"])
+
+        with metrics.span("process_start"):
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "wrapper.py",
+                cwd=self.path,
+                env=env,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+            )
+        return ProcessWorker(name, process)
+
+    async def _destroy(self, worker: ProcessWorker) -> None:
+        """Kills the worker's process."""
+        await worker.kill()
+
+
+class LocalExecutor(Executor):
+    """Runs functions on pools of local worker processes."""
+
+    name = "local"
+
+    async def prepare(self, function_data: schemas.FunctionCreate) -> str:
+        """Writes the function's code to a content-addressed directory."""
+        digest = builder.function_image_digest(function_data)
+        image_uri = f"local://{function_data.name}@{digest[:settings.image_tag_length]}"
+        await asyncio.to_thread(_materialize, {
+            "image_uri": image_uri,
+            "handler": function_data.handler,
+            "code": function_data.code,
+        })
+        return image_uri
+
+    async def _create_pool(self, function_details: Dict[str, Any]) -> FunctionPool:
+        # The directory may be gone after a restart; the code is in the store.
+        return ProcessPool(function_details, await asyncio.to_thread(_materialize, function_details))
@@ -0,0 +1,248 @@
+"""
+Non-blocking access to the Kubernetes API for the orchestrator.
+
+The official Kubernetes client is synchronous, so every API call is run
+on a bounded thread pool that shares one pooled HTTP connection set.
+Instead of opening a watch per invocation, a single namespace-wide watch
+per resource type runs in a background thread and fans events out to the
+coroutines waiting on individual Jobs or pods.
+
+Configuration is loaded on first use, so importing the platform does not
+require a kubeconfig unless a Kubernetes-backed function is actually run.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes import client, config, watch
+
+from .. import metrics
+from ..config import settings
+
+# Label applied to every pod and Job created by the platform, so the shared
+# watches only see our own objects.
+MANAGED_LABEL = "radical-faas/managed"
+
+
+def configure_kubernetes_client() -> client.ApiClient:
+    """Loads Kubernetes configuration and returns a client with a sized connection pool."""
+    configuration = client.Configuration()
+    try:
+        config.load_kube_config(client_configuration=configuration)
+        print("Orchestrator: Loaded K8s config from kubeconfig file.")
+    except config.ConfigException:
+        config.load_incluster_config(client_configuration=configuration)
+        print("Orchestrator: Loaded K8s config from in-cluster service account.")
+    # Watches hold their own connections on top of the executor's threads.
+    configuration.connection_pool_maxsize = settings.kube_api_max_workers + 2
+    return client.ApiClient(configuration)
+
+
+@functools.lru_cache(maxsize=None)
+def api_client() -> client.ApiClient:
+    """Returns the shared API client, loading the configuration on first use."""
+    return configure_kubernetes_client()
+
+
+@functools.lru_cache(maxsize=None)
+def core_v1_api() -> client.CoreV1Api:
+    """Returns the shared core API."""
+    return client.CoreV1Api(api_client())
+
+
+@functools.lru_cache(maxsize=None)
+def batch_v1_api() -> client.BatchV1Api:
+    """Returns the shared batch API."""
+    return client.BatchV1Api(api_client())
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.kube_api_max_workers, thread_name_prefix="kube-api"
+)
+
+
+async def call(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs a blocking Kubernetes API call on the shared executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+class ResourceWatcher:
+    """
+    Multiplexes one namespace-wide watch across many waiting coroutines.
+
+    Args:
+        list_func: The namespaced list call to watch (e.g., list_namespaced_job).
+        key_func: Maps a watched object to the key waiters register under,
+            or None for objects nobody can wait on.
+    """
+
+    def __init__(self, list_func: Callable[..., Any], key_func: Callable[[Any], Optional[str]]):
+        self.list_func = list_func
+        self.key_func = key_func
+        self._latest: Dict[str, Any] = {}
+        self._waiters: Dict[str, List[Tuple[Callable[[Any], Any], asyncio.Future]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._thread = threading.Thread(
+                target=self._run, name=f"watch-{self.list_func.__name__}", daemon=True
+            )
+            self._thread.start()
+
+    async def wait_for(self, key: str, predicate: Callable[[Any], Any], timeout: float) -> Any:
+        """
+        Waits until the object with the given key satisfies a predicate.
+
+        Args:
+            key: The key of the object to wait on.
+            predicate: Called with every new version of the object. A return
+                value other than None resolves the wait; an exception fails it.
+            timeout: Seconds to wait before raising TimeoutError.
+
+        Returns:
+            The predicate's first non-None return value.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        entry = (predicate, future)
+        self._waiters.setdefault(key, []).append(entry)
+        if key in self._latest:
+            self._resolve(entry, self._latest[key])
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timed out waiting for '{key}'.")
+        finally:
+            waiters = self._waiters.get(key, [])
+            if entry in waiters:
+                waiters.remove(entry)
+            if not waiters:
+                self._waiters.pop(key, None)
+
+    def _resolve(self, entry: Tuple[Callable[[Any], Any], asyncio.Future], obj: Any) -> None:
+        predicate, future = entry
+        if future.done():
+            return
+        try:
+            value = predicate(obj)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        if value is not None:
+            future.set_result(value)
+
+    def _dispatch(self, event_type: str, key: str, obj: Any) -> None:
+        """Runs on the event loop and hands a watch event to its waiters."""
+        if event_type == "DELETED":
+            self._latest.pop(key, None)
+        else:
+            self._latest[key] = obj
+        for entry in list(self._waiters.get(key, [])):
+            self._resolve(entry, obj)
+
+    def _run(self) -> None:
+        """Streams events forever, restarting the watch whenever it ends or fails."""
+        resource_version = None
+        while True:
+            w = watch.Watch()
+            try:
+                for event in w.stream(
+                    self.list_func,
+                    namespace=settings.job_namespace,
+                    label_selector=f"{MANAGED_LABEL}=true",
+                    resource_version=resource_version,
+                    timeout_seconds=300,
+                ):
+                    obj = event["object"]
+                    resource_version = obj.metadata.resource_version
+                    key = self.key_func(obj)
+                    if key is not None:
+                        self._loop.call_soon_threadsafe(self._dispatch, event["type"], key, obj)
+            except client.ApiException as e:
+                if e.status == 410:
+                    # Our resource version expired; start over from a fresh list.
+                    resource_version = None
+                else:
+                    print(f"Orchestrator: Watch on {self.list_func.__name__} failed: {e}")
+                    time.sleep(1)
+            except Exception as e:
+                print(f"Orchestrator: Watch on {self.list_func.__name__} failed: {e}")
+                resource_version = None
+                time.sleep(1)
+
+
+def _pod_key(pod: client.V1Pod) -> Optional[str]:
+    labels = pod.metadata.labels or {}
+    return labels.get("radical-faas/worker") or labels.get("job-name")
+
+
+@functools.lru_cache(maxsize=None)
+def job_watcher() -> ResourceWatcher:
+    """Returns the shared watch over the platform's Jobs."""
+    return ResourceWatcher(batch_v1_api().list_namespaced_job, lambda job: job.metadata.name)
+
+
+@functools.lru_cache(maxsize=None)
+def pod_watcher() -> ResourceWatcher:
+    """Returns the shared watch over the platform's pods."""
+    return ResourceWatcher(core_v1_api().list_namespaced_pod, _pod_key)
+
+
+def _running_pod_ip(pod: client.V1Pod) -> Optional[str]:
+    status = pod.status
+    if status.phase == "Running" and status.pod_ip:
+        return status.pod_ip
+    if status.phase in ("Succeeded", "Failed"):
+        raise RuntimeError(f"Pod '{pod.metadata.name}' exited with phase '{status.phase}'.")
+    return None
+
+
+async def wait_for_pod_ip(key: str) -> str:
+    """
+    Waits until a worker pod or a Job's pod is running.
+
+    The wait is recorded as two phases: until the pod is bound to a node
+    (pod_schedule), and from then until its container is running
+    (container_start).
+
+    Args:
+        key: A pool worker's pod name, or the name of the Job owning the pod.
+
+    Returns:
+        The pod's IP address.
+    """
+    started = time.perf_counter()
+    scheduled_at = []
+
+    def predicate(pod: client.V1Pod) -> Optional[str]:
+        if pod.spec.node_name and not scheduled_at:
+            scheduled_at.append(time.perf_counter())
+        return _running_pod_ip(pod)
+
+    pod_ip = await pod_watcher().wait_for(key, predicate, settings.worker_startup_timeout_seconds)
+    running_at = time.perf_counter()
+    scheduled = scheduled_at[0] if scheduled_at else running_at
+    metrics.observe("pod_schedule", scheduled - started)
+    metrics.observe("container_start", running_at - scheduled)
+    return pod_ip
+
+
+def _job_outcome(job: client.V1Job) -> Optional[bool]:
+    if job.status.succeeded:
+        return True
+    if job.status.failed:
+        raise RuntimeError(f"Job '{job.metadata.name}' failed.")
+    return None
+
+
+async def wait_for_job(job_name: str, timeout: Optional[float] = None) -> None:
+    """Waits until a Job has succeeded, raising if it failed or timed out (after job_timeout_seconds by default)."""
+    await job_watcher().wait_for(job_name, _job_outcome, timeout or settings.job_timeout_seconds)
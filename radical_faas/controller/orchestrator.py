@@ -0,0 +1,248 @@
+"""
+The core orchestrator for RADICAL-FaaS.
+
+This module turns FaaS-specific requests into work for an executor: the
+backend a function was deployed onto, such as Kubernetes or local worker
+processes. It owns deployment bookkeeping and batch fan-out, while each
+executor decides how an individual invocation actually runs.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from . import executors
+from .result_cache import cache, result_key
+from .. import metrics
+from ..api import schemas
+from ..store import metadata
+from ..config import settings
+
+# Deploy request fields that, when changed, require the saved record to be updated.
+_DEPLOYMENT_SETTINGS = (
+    "pool_size", "pool_min_size", "timeout_seconds", "memory_limit_mb", "cacheable", "cache_ttl_seconds",
+)
+
+
+async def deploy_new_function(function_data: schemas.FunctionCreate) -> str:
+    """
+    Orchestrates the deployment of a new serverless function.
+
+    Returns:
+        The URI of the function's prepared artifact, such as its container image.
+    """
+    print(f"Orchestrator: Starting deployment for '{function_data.name}'.")
+    executor = executors.get_executor(function_data.executor or settings.default_executor)
+    with metrics.span("prepare"):
+        image_uri = await executor.prepare(function_data)
+
+    deployed = {
+        "image_uri": image_uri,
+        "executor": executor.name,
+        **{field: getattr(function_data, field) for field in _DEPLOYMENT_SETTINGS},
+    }
+    current = await metadata.get_function_details(function_data.name)
+    if current and all(current[field] == value for field, value in deployed.items()):
+        print(f"Orchestrator: '{function_data.name}' is already deployed with '{image_uri}'.")
+        return image_uri
+
+    await metadata.save_function_details(
+        name=function_data.name,
+        handler=function_data.handler,
+        runtime=function_data.runtime,
+        code=function_data.code,
+        **deployed,
+    )
+    print(f"Orchestrator: Saved metadata for '{function_data.name}'.")
+
+    # The function may have moved between executors, so clear it from all of them.
+    await executors.release_everywhere(function_data.name)
+    if function_data.pool_min_size > 0:
+        details = await metadata.get_function_details(function_data.name)
+        if executor.uses_pool(details):
+            await executor.warm(details)
+            print(f"Orchestrator: Pre-warming pool for '{function_data.name}'.")
+    return image_uri
+
+
+async def schedule_and_run_function(
+    function_name: str,
+    payload: dict,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Schedules and runs a function, then waits for and returns the result.
+
+    Args:
+        function_name: The name of the function to invoke.
+        payload: The input for the function.
+        timings: If given, receives the milliseconds spent in each phase of
+            the invocation, and in total.
+    """
+    print(f"Orchestrator: Invoking '{function_name}'.")
+
+    invoked = time.perf_counter()
+    function_details = await metadata.get_function_details(function_name)
+    if not function_details:
+        raise ValueError(f"Function '{function_name}' not found.")
+
+    # The function label is only set once the function is known to exist, so
+    # calls to arbitrary names cannot add label sets to the metrics.
+    with metrics.track(function_name, timings):
+        metrics.observe("metadata_lookup", time.perf_counter() - invoked)
+        executor = executors.get_executor(function_details["executor"])
+
+        run = functools.partial(
+            _run_recorded, function_name, functools.partial(executor.invoke, function_details, payload)
+        )
+        outcome = "error"
+        try:
+            result = await _through_cache(function_details, payload, run)
+            outcome = "success"
+            return result
+        finally:
+            _count_invocation(function_name, outcome, invoked)
+            if timings is not None:
+                timings["total"] = (time.perf_counter() - invoked) * 1000
+
+
+async def _run_recorded(function_name: str, invoke: Callable[[], Awaitable[Any]]) -> Any:
+    """Runs one execution of a function and records it in the invocations table."""
+    started_at, started = time.time(), time.perf_counter()
+    error = None
+    try:
+        return await invoke()
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        metadata.record_invocation(
+            function_name, started_at, (time.perf_counter() - started) * 1000, error
+        )
+
+
+def _count_invocation(function_name: str, outcome: str, started: float) -> None:
+    """Records one invocation's end-to-end time and outcome."""
+    metrics.invocation_duration.observe(time.perf_counter() - started, function_name, outcome)
+    metrics.invocations.inc(function_name, outcome)
+
+
+async def _through_cache(function_details: Dict[str, Any], payload: Any, run: Callable[[], Awaitable[Any]]) -> Any:
+    """Runs an invocation, reusing an earlier result if the function is cacheable."""
+    key = result_key(function_details["image_uri"], payload) if function_details["cacheable"] else None
+    if key is None:
+        return await run()
+    ttl = function_details["cache_ttl_seconds"] or settings.result_cache_ttl_seconds
+    return await cache.get_or_run(key, ttl, run)
+
+
+async def run_batch(
+    function_name: str,
+    payloads: List[Any],
+    workers: int,
+    ordered: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Fans a list of payloads out over several workers and streams back the results.
+
+    Each worker is a lane that runs many payloads in sequence on a worker
+    provided by the function's executor, such as a one-off Job serving the
+    framed protocol or the function's warm pool.
+    The payloads are validated and held in memory up front, and results
+    that finish before the caller reads them are held until it does.
+
+    Args:
+        function_name: The name of the function to invoke.
+        payloads: The inputs, in order.
+        workers: Number of lanes to run concurrently, capped by batch_max_workers.
+        ordered: Yield results in input order instead of completion order.
+
+    Returns:
+        An async iterator of per-item results. Each item has an 'index' and
+        either a 'result' or an 'error'.
+    """
+    function_details = await metadata.get_function_details(function_name)
+    if not function_details:
+        raise ValueError(f"Function '{function_name}' not found.")
+    lanes = max(1, min(workers, settings.batch_max_workers))
+    print(f"Orchestrator: Running batch of '{function_name}' on {lanes} workers.")
+    return _stream_batch(function_details, payloads, lanes, ordered)
+
+
+async def _stream_batch(
+    function_details: Dict[str, Any],
+    payloads: List[Any],
+    lanes: int,
+    ordered: bool,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Runs the lanes of a batch and yields their results."""
+    done = object()
+    executor = executors.get_executor(function_details["executor"])
+    inputs: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(payloads):
+        inputs.put_nowait(item)
+    # One sentinel per lane follows the last payload.
+    for _ in range(lanes):
+        inputs.put_nowait(done)
+    outputs: asyncio.Queue = asyncio.Queue()
+    alive = [lanes]
+
+    async def run_lane() -> None:
+        try:
+            async with executor.lane(function_details) as invoke:
+                lost = None
+
+                async def run(payload: Any) -> Any:
+                    nonlocal lost
+                    try:
+                        return await _run_recorded(function_details["name"], functools.partial(invoke, payload))
+                    except executors.LaneLost as e:
+                        lost = e
+                        raise
+
+                while (item := await inputs.get()) is not done:
+                    index, payload = item
+                    started = time.perf_counter()
+                    try:
+                        result = await _through_cache(function_details, payload, functools.partial(run, payload))
+                        outputs.put_nowait({"index": index, "status": "success", "result": result})
+                        _count_invocation(function_details["name"], "success", started)
+                    except Exception as e:
+                        outputs.put_nowait({"index": index, "status": "error", "error": str(e)})
+                        _count_invocation(function_details["name"], "error", started)
+                        if lost is not None:
+                            # The lane's worker is gone; leave the remaining items to the other lanes.
+                            # A failure shared from another lane's cached run leaves this one intact.
+                            raise lost
+        except Exception as e:
+            print(f"Orchestrator: Batch worker for '{function_details['name']}' failed: {e}")
+            alive[0] -= 1
+            if alive[0] == 0:
+                # No lane is left to run the rest of the batch.
+                while (item := await inputs.get()) is not done:
+                    outputs.put_nowait({"index": item[0], "status": "error", "error": str(e)})
+        finally:
+            outputs.put_nowait(done)
+
+    # Tasks inherit the tracked function, so spans inside the lanes are labelled with it.
+    with metrics.track(function_details["name"]):
+        tasks = [asyncio.create_task(run_lane()) for _ in range(lanes)]
+    try:
+        finished, pending, next_index = 0, {}, 0
+        while finished < lanes:
+            item = await outputs.get()
+            if item is done:
+                finished += 1
+            elif not ordered:
+                yield item
+            else:
+                pending[item["index"]] = item
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
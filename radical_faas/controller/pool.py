@@ -0,0 +1,202 @@
+"""
+Warm worker pools that keep function processes resident between invocations.
+
+A pool owns a set of long-lived workers for one function. Each worker
+runs the wrapper in serve mode, so the handler is imported once and every
+invocation is a single request/response frame exchange instead of a cold
+start. Pools grow when invocations queue up and shrink again once workers
+have been idle for longer than the configured timeout.
+
+FunctionPool implements the scaling and dispatch logic; executors subclass
+it to decide what a worker is (a pod, a local process) and how it is
+started and torn down.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, List, Optional, Set
+
+from .worker import FunctionError, Worker
+from .. import metrics
+from ..config import settings
+from ..runtime import protocol
+
+
+class PoolClosedError(RuntimeError):
+    """Raised to invocations still waiting for a worker when their pool shuts down."""
+
+
+class FunctionPool:
+    """
+    Dispatches invocations of one function to a pool of warm workers.
+
+    Args:
+        function_name: The name of the function served by the pool.
+        max_size: Upper bound on the number of workers.
+        min_size: Number of workers kept alive even when idle.
+        timeout: Seconds an invocation may run before its worker is killed.
+            Defaults to job_timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        function_name: str,
+        max_size: int,
+        min_size: int = 0,
+        timeout: Optional[float] = None,
+    ):
+        self.function_name = function_name
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.timeout = timeout or settings.job_timeout_seconds
+
+        self._idle: List[Worker] = []
+        self._size = 0
+        self._starting = 0
+        self._waiters = 0
+        self._closed = False
+        self._start_error: Optional[Exception] = None
+        self._available = asyncio.Condition()
+        self._reaper: Optional[asyncio.Task] = None
+        self._startup_tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Starts the idle reaper and pre-warms the minimum number of workers."""
+        self._reaper = asyncio.create_task(self._reap_idle_workers())
+        async with self._available:
+            for _ in range(self.min_size):
+                self._reserve_worker()
+
+    async def invoke(self, payload: Any) -> Any:
+        """
+        Runs the function on an idle worker, scaling the pool up if needed.
+
+        Args:
+            payload: The JSON-serializable input for the function, or raw bytes.
+
+        Returns:
+            The result returned by the function's handler.
+        """
+        with metrics.span("worker_acquire"):
+            worker = await self._acquire()
+        try:
+            result, _ = await asyncio.wait_for(worker.invoke(payload), self.timeout)
+        except FunctionError:
+            await self._release(worker)
+            raise
+        except asyncio.TimeoutError:
+            # The handler is still running; the worker cannot be reused.
+            await self._discard(worker)
+            raise TimeoutError(f"Function '{self.function_name}' timed out after {self.timeout}s.")
+        except (ConnectionError, OSError, protocol.ProtocolError) as e:
+            await self._discard(worker)
+            raise RuntimeError(f"Worker '{worker.name}' failed: {e}")
+        except BaseException:
+            # A cancelled call or an undecodable result leaves the worker mid-frame,
+            # and it must not stay counted against the pool without ever being released.
+            await asyncio.shield(self._discard(worker))
+            raise
+        await self._release(worker)
+        return result
+
+    async def shutdown(self) -> None:
+        """Stops the reaper and deletes every worker in the pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+        async with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Invocations still queued for a worker must not wait forever.
+            self._available.notify_all()
+        for worker in idle:
+            await self._discard(worker)
+        print(f"Pool: Shut down pool for '{self.function_name}'.")
+
+    async def _acquire(self) -> Worker:
+        """Takes an idle worker, starting new ones while invocations outnumber starting workers."""
+        if self.max_size == 0:
+            raise RuntimeError(f"Pool for '{self.function_name}' has no room for workers.")
+        async with self._available:
+            self._waiters += 1
+            try:
+                while not self._idle:
+                    if self._closed:
+                        raise PoolClosedError(f"Pool for '{self.function_name}' is shut down.")
+                    if self._waiters > self._starting and self._size < self.max_size:
+                        self._reserve_worker()
+                    await self._available.wait()
+                    if not self._idle and self._size == 0 and self._start_error:
+                        raise RuntimeError(f"Could not start a worker: {self._start_error}")
+                return self._idle.pop()
+            finally:
+                self._waiters -= 1
+
+    async def _release(self, worker: Worker) -> None:
+        """Returns a worker to the idle set and wakes one waiting invocation."""
+        async with self._available:
+            if not self._closed:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+        await self._discard(worker)
+
+    async def _discard(self, worker: Worker) -> None:
+        """Removes a worker from the pool and tears it down."""
+        async with self._available:
+            self._size -= 1
+            self._available.notify()
+        await self._destroy(worker)
+
+    def _reserve_worker(self) -> None:
+        """Counts a new worker against the pool size and starts it in the background."""
+        self._size += 1
+        self._starting += 1
+        # The worker outlives the request that triggered it, so it must not report into that request's timings.
+        task = asyncio.create_task(self._start_worker(), context=metrics.function_context(self.function_name))
+        self._startup_tasks.add(task)
+        task.add_done_callback(self._startup_tasks.discard)
+
+    async def _start_worker(self) -> None:
+        """Starts a worker and adds it to the idle set."""
+        name = f"{self.function_name}-worker-{uuid.uuid4().hex[:6]}"
+        try:
+            worker = await self._spawn(name)
+        except Exception as e:
+            print(f"Pool: Failed to start worker '{name}': {e}")
+            async with self._available:
+                self._starting -= 1
+                self._size -= 1
+                self._start_error = e
+                self._available.notify_all()
+            return
+
+        print(f"Pool: Worker '{name}' is ready for '{self.function_name}'.")
+        async with self._available:
+            self._starting -= 1
+            self._start_error = None
+        await self._release(worker)
+
+    async def _spawn(self, name: str) -> Worker:
+        """Starts a worker and returns it once it accepts invocations. Cleans up after itself on failure."""
+        raise NotImplementedError
+
+    async def _destroy(self, worker: Worker) -> None:
+        """Stops a worker and releases everything it holds."""
+        raise NotImplementedError
+
+    async def _reap_idle_workers(self) -> None:
+        """Periodically evicts workers that have been idle for too long."""
+        timeout = settings.pool_idle_timeout_seconds
+        while True:
+            await asyncio.sleep(min(timeout, 30))
+            now = time.monotonic()
+            async with self._available:
+                expired = [
+                    w for w in self._idle if now - w.last_used > timeout
+                ][:max(self._size - self.min_size, 0)]
+                for worker in expired:
+                    self._idle.remove(worker)
+            for worker in expired:
+                print(f"Pool: Evicting idle worker '{worker.name}'.")
+                await self._discard(worker)
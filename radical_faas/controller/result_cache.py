@@ -0,0 +1,190 @@
+"""
+Caches the results of functions deployed as cacheable.
+
+Results are keyed by the function's image URI, which is content-addressed
+and so changes whenever the function's code or dependencies do, plus a
+hash of the canonical JSON form of the payload. Entries expire after a
+TTL and the least recently used entry is evicted once the cache is full;
+with result_cache_spill enabled, evicted entries are written to the
+metadata store in the background, in batches, and looked up there before
+the function is run again.
+
+Concurrent requests for the same key are coalesced: the first one runs
+the function and the others wait for its outcome, so a burst of identical
+requests costs a single execution.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .. import metrics
+from ..config import settings
+from ..store import metadata
+
+
+def result_key(image_uri: str, payload: Any) -> Optional[str]:
+    """
+    Computes the cache key for invoking a function image with a payload.
+
+    Returns:
+        The key, or None if the payload has no canonical JSON form and so
+        cannot be cached.
+    """
+    try:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(f"{image_uri}\0{canonical}".encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    A TTL and size-bounded LRU cache of function results with single-flight execution.
+
+    Args:
+        max_entries: Number of results kept in memory.
+        spill: Write evicted results to the metadata store.
+    """
+
+    def __init__(self, max_entries: int, spill: bool = False):
+        self.max_entries = max_entries
+        self.spill = spill
+        # key -> (expiry as Unix time, result), least recently used first.
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Evicted results waiting to be spilled: key -> (result as JSON, expiry).
+        self._spilling: Dict[str, Tuple[str, float]] = {}
+        self._spiller: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.spill_hits = 0
+        self.evictions = 0
+
+    async def get_or_run(self, key: str, ttl: float, run: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached result for a key, or runs the function to produce it.
+
+        Only successful results are cached. If the run fails, every request
+        coalesced onto it receives the same exception.
+
+        Args:
+            key: The key from result_key().
+            ttl: Seconds a new result stays fresh.
+            run: Runs the function once when no fresh result exists.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._fill(key, ttl, run))
+            # Nobody may be left to await a failed run if all its callers disconnected.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        # A caller that disconnects must not cancel the run the others are waiting on.
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: str, ttl: float, run: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            if self.spill:
+                spilled = self._spilling.get(key) or await metadata.get_cached_result(key)
+                if spilled is not None and spilled[1] > time.time():
+                    self.spill_hits += 1
+                    value, expires_at = spilled
+                    result = json.loads(value)
+                    # A spilled result keeps its original expiry.
+                    self._entries[key] = (expires_at, result)
+                    self._evict()
+                    return result
+            result = await run()
+            self._entries[key] = (time.time() + ttl, result)
+            self._evict()
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _evict(self) -> None:
+        """Evicts least recently used results until the cache is within its bound."""
+        while len(self._entries) > self.max_entries:
+            key, (expires_at, result) = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.spill and expires_at > time.time():
+                try:
+                    self._spilling[key] = (json.dumps(result), expires_at)
+                except (TypeError, ValueError):
+                    pass
+        if self._spilling and self._spiller is None:
+            # Spilling goes through the store's writer thread, which must not
+            # hold up the invocation that triggered the eviction.
+            self._spiller = asyncio.create_task(self._write_spilled())
+
+    async def _write_spilled(self) -> None:
+        """Writes evicted results to the store, batching whatever accumulates during each write."""
+        try:
+            while self._spilling:
+                batch = dict(self._spilling)
+                try:
+                    await metadata.save_cached_results(
+                        [(key, value, expires_at) for key, (value, expires_at) in batch.items()]
+                    )
+                except Exception as e:
+                    print(f"Cache: Failed to spill {len(batch)} results: {e}")
+                for key, spilled in batch.items():
+                    if self._spilling.get(key) is spilled:
+                        del self._spilling[key]
+        finally:
+            self._spiller = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache's counters and current size."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "spill_hits": self.spill_hits,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced + self.spill_hits) / lookups if lookups else 0.0,
+        }
+
+    def collect(self) -> List[str]:
+        """Returns the cache's counters in the Prometheus text format."""
+        lines = [
+            "# HELP radical_faas_result_cache_requests_total Result cache lookups by outcome.",
+            "# TYPE radical_faas_result_cache_requests_total counter",
+        ]
+        for outcome in ("hits", "misses", "coalesced", "spill_hits"):
+            lines.append(f'radical_faas_result_cache_requests_total{{outcome="{outcome}"}} {getattr(self, outcome)}')
+        lines += [
+            "# HELP radical_faas_result_cache_evictions_total Results evicted from memory.",
+            "# TYPE radical_faas_result_cache_evictions_total counter",
+            f"radical_faas_result_cache_evictions_total {self.evictions}",
+            "# HELP radical_faas_result_cache_entries Results currently held in memory.",
+            "# TYPE radical_faas_result_cache_entries gauge",
+            f"radical_faas_result_cache_entries {len(self._entries)}",
+        ]
+        return lines
+
+    def clear(self) -> None:
+        """Drops every cached result held in memory."""
+        self._entries.clear()
+
+
+# The platform-wide result cache.
+cache = ResultCache(settings.result_cache_max_entries, spill=settings.result_cache_spill)
+metrics.register_collector(cache.collect)
@@ -0,0 +1,110 @@
+"""
+Orchestrator-side connections to running function containers.
+
+A Worker wraps one stream to a wrapper running in serve mode, either a TCP
+connection to a container or the stdin/stdout pipes of a local process,
+and exchanges protocol frames with it. Workers are used both by warm
+pools, which keep them open across invocations, and by one-off Jobs,
+which open one for a single invocation and then tell the container to
+exit.
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .. import metrics
+from ..config import settings
+from ..runtime import protocol
+
+
+class FunctionError(RuntimeError):
+    """Raised when the user's handler raised an exception inside the container."""
+
+    def __init__(self, message: str, traceback: Optional[str] = None):
+        super().__init__(message)
+        self.traceback = traceback
+
+
+class Worker:
+    """A connection to a single function container or process."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+
+    async def connect(self, host: str, port: Optional[int] = None) -> None:
+        """Connects to the container, retrying while the wrapper is still starting up."""
+        port = port or settings.worker_port
+        deadline = time.monotonic() + settings.worker_startup_timeout_seconds
+        with metrics.span("worker_connect"):
+            while True:
+                try:
+                    self.reader, self.writer = await asyncio.open_connection(host, port)
+                    return
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise
+                    await asyncio.sleep(0.2)
+
+    async def invoke(self, payload: Any) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Sends one payload to the container and waits for its response.
+
+        Args:
+            payload: A JSON-serializable value or raw bytes.
+
+        Returns:
+            The handler's result and the response frame's metadata, which
+            includes the handler's execution time under 'duration_ms'.
+
+        Raises:
+            FunctionError: If the handler raised an exception.
+            ConnectionError: If the container went away mid-invocation.
+        """
+        started = time.perf_counter()
+        content_type, body = protocol.encode_value(payload)
+        request_id = next(self._ids)
+        await protocol.write_frame_async(
+            self.writer, protocol.INVOKE, {"id": request_id, "content_type": content_type}, body
+        )
+        frame = await protocol.read_frame_async(self.reader)
+        if frame is None:
+            raise ConnectionError(f"Worker '{self.name}' closed the connection.")
+        self.last_used = time.monotonic()
+
+        # Whatever the handler itself did not account for went to moving the
+        # payload and result between us and the wrapper (and, on a worker's
+        # first call, to the wrapper still importing the handler).
+        handler_seconds = frame.meta.get("duration_ms", 0) / 1000
+        metrics.observe("handler", handler_seconds)
+        metrics.observe("result_retrieval", max(0.0, time.perf_counter() - started - handler_seconds))
+
+        if frame.kind == protocol.ERROR:
+            raise FunctionError(frame.meta.get("error", "Unknown error"), frame.meta.get("traceback"))
+        if frame.kind != protocol.RESULT or frame.meta.get("id") != request_id:
+            raise protocol.ProtocolError(f"Unexpected response from worker '{self.name}'.")
+        return protocol.decode_value(frame.meta.get("content_type"), frame.body), frame.meta
+
+    async def shutdown(self) -> None:
+        """Asks the container to exit and closes the connection."""
+        if self.writer is not None:
+            try:
+                await protocol.write_frame_async(self.writer, protocol.SHUTDOWN)
+            except ConnectionError:
+                pass
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the connection to the container, if one is open."""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
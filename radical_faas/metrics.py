@@ -0,0 +1,224 @@
+"""
+Timing spans and Prometheus-compatible metrics for the platform.
+
+Every phase of a deployment or invocation (metadata lookup, Job creation,
+pod scheduling, handler execution, image build, ...) is timed with span()
+or observe() and recorded in a histogram labelled with the phase and the
+function. Code that handles a request wraps it in track(), which sets the
+function label for every span underneath it, however deep, and can also
+collect the request's own per-phase timings to return to the caller.
+
+Metrics are kept in process and rendered in the Prometheus text format by
+render(). Histograms may be updated from worker threads, such as a
+build's, so updates take a lock.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bucket bounds in seconds, from sub-millisecond local dispatch up to image builds.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 30, 60, 120, 300, 600,
+)
+
+_function: contextvars.ContextVar[str] = contextvars.ContextVar("radical_function", default="")
+_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("radical_timings", default=None)
+
+_metrics: List["Metric"] = []
+_collectors: List[Callable[[], List[str]]] = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base class for metrics that register themselves for rendering.
+
+    Args:
+        name: The metric's name.
+        description: The metric's HELP text.
+        labels: The names of the metric's labels.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def render(self) -> List[str]:
+        """Returns the metric's lines in the Prometheus text format."""
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    """A distribution of observed values per label set, in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (count per bucket, sum, count)
+        self._values: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            values = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        for label_values, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ("le",), label_values + (_format_value(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+phase_duration = Histogram(
+    "radical_faas_phase_duration_seconds",
+    "Time spent in each phase of deploying or invoking a function.",
+    ("phase", "function"),
+)
+invocation_duration = Histogram(
+    "radical_faas_invocation_duration_seconds",
+    "End-to-end time of function invocations, including cache hits.",
+    ("function", "status"),
+)
+invocations = Counter(
+    "radical_faas_invocations_total",
+    "Function invocations by outcome.",
+    ("function", "status"),
+)
+
+
+@contextmanager
+def track(function_name: str, timings: Optional[Dict[str, float]] = None) -> Iterator[None]:
+    """
+    Attributes every span inside the block to a function.
+
+    Args:
+        function_name: The function being deployed or invoked.
+        timings: If given, receives the total milliseconds spent in each
+            phase inside the block, including in tasks and threads it starts.
+    """
+    function_token = _function.set(function_name)
+    timings_token = _timings.set(timings) if timings is not None else None
+    try:
+        yield
+    finally:
+        if timings_token is not None:
+            _timings.reset(timings_token)
+        _function.reset(function_token)
+
+
+def function_context(function_name: str) -> contextvars.Context:
+    """
+    Returns a fresh context in which only the function label is set.
+
+    Background tasks started on behalf of a request, such as a pool's worker
+    startups, run in such a context, so their spans keep the function label
+    but are not added to the timings of whichever request happened to start them.
+    """
+    context = contextvars.Context()
+    context.run(_function.set, function_name)
+    return context
+
+
+def observe(phase: str, seconds: float) -> None:
+    """Records the time a phase took for the function being tracked."""
+    phase_duration.observe(seconds, phase, _function.get())
+    timings = _timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds * 1000
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    """Times the block as one phase, whether or not it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(phase, time.perf_counter() - started)
+
+
+def register_collector(collector: Callable[[], List[str]]) -> None:
+    """Adds a callable returning extra metric lines, for values kept outside this module."""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """Renders every metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,290 @@
+"""
+Builds user source code into a runnable container image.
+
+This module uses the Docker SDK to dynamically create a Dockerfile,
+build an image containing the user's function and a wrapper, and
+push it to a container registry.
+
+Images are content-addressed and built in two layers. A base image holds
+the runtime, the installed dependencies and the wrapper, and is shared by
+every function with the same runtime and requirements. The function image
+only adds the user's module on top. Both are tagged with a digest of
+their inputs, so an identical deploy finds its image already built and a
+code-only redeploy rebuilds nothing but the thin top layer.
+"""
+
+import asyncio
+import docker
+import functools
+import hashlib
+import os
+import tempfile
+import shutil
+import json
+from typing import Dict, List, Tuple
+
+from .. import metrics
+from ..api import schemas
+from ..config import settings
+
+
+PROTOCOL_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "protocol.py")
+
+
+# This executor script runs inside the container and executes the user's code.
+# By default it stays resident: the handler is imported once and invocations
+# are exchanged as protocol frames (see runtime/protocol.py) over a TCP socket
+# on RADICAL_PORT, or over stdin/stdout when RADICAL_TRANSPORT=stdio. The
+# 'legacy' mode keeps the old one-shot behaviour of reading RADICAL_PAYLOAD
+# and printing the result between markers, followed by the handler's
+# execution time. RADICAL_MEMORY_LIMIT_MB caps the
+# process's address space.
+WRAPPER_SCRIPT = """
+import os
+import sys
+import json
+import time
+import socket
+import importlib
+import traceback
+
+import radical_protocol as protocol
+
+def load_handler(handler_str):
+    module_name, function_name = handler_str.split('.')
+    print(f"Wrapper: Importing '{function_name}' from '{module_name}.py'...", file=sys.stderr)
+    user_module = importlib.import_module(module_name)
+    return getattr(user_module, function_name)
+
+def handle_frame(handler_func, frame):
+    meta = {"id": frame.meta.get("id")}
+    started = time.perf_counter()
+    try:
+        payload = protocol.decode_value(frame.meta.get("content_type", protocol.CONTENT_JSON), frame.body)
+        result = handler_func(payload)
+        meta["content_type"], body = protocol.encode_value(result)
+        kind = protocol.RESULT
+    except Exception as e:
+        kind, body = protocol.ERROR, b""
+        meta["error"] = f"{type(e).__name__}: {e}"
+        meta["traceback"] = traceback.format_exc()
+    meta["duration_ms"] = (time.perf_counter() - started) * 1000
+    return kind, meta, body
+
+def serve_stream(handler_func, rfile, wfile):
+    # Returns True when the orchestrator asked the worker to exit.
+    while True:
+        frame = protocol.read_frame(rfile)
+        if frame is None:
+            return False
+        if frame.kind == protocol.SHUTDOWN:
+            return True
+        if frame.kind != protocol.INVOKE:
+            protocol.write_frame(wfile, protocol.ERROR, {"error": f"Unexpected frame kind {frame.kind}."})
+            continue
+        protocol.write_frame(wfile, *handle_frame(handler_func, frame))
+
+def serve_socket(handler_func, port):
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("0.0.0.0", port))
+    server.listen(1)
+    print(f"Wrapper: Serving invocations on port {port}...", file=sys.stderr)
+
+    while True:
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with conn, conn.makefile("rb") as rfile, conn.makefile("wb") as wfile:
+            if serve_stream(handler_func, rfile, wfile):
+                return
+
+def claim_stdio():
+    # Moves the frame stream onto private copies of fds 0 and 1, then points
+    # fd 1 at stderr and fd 0 at /dev/null. Must run before the user's module
+    # is imported, so nothing it (or a C extension or subprocess) writes to
+    # stdout or reads from stdin can touch the frame stream.
+    rfile = os.fdopen(os.dup(0), "rb")
+    wfile = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdout = sys.stderr
+    return rfile, wfile
+
+def serve_stdio(handler_func, rfile, wfile):
+    serve_stream(handler_func, rfile, wfile)
+
+def run_once(handler_func):
+    payload = json.loads(os.environ.get("RADICAL_PAYLOAD", "{}"))
+    print(f"Wrapper: Executing function with payload: {payload}")
+    started = time.perf_counter()
+    result = handler_func(payload)
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    print("---RESULT_START---")
+    print(json.dumps(result))
+    print("---RESULT_END---")
+    print(f"---HANDLER_MS:{duration_ms}---")
+
+def limit_memory():
+    limit_mb = os.environ.get("RADICAL_MEMORY_LIMIT_MB")
+    if limit_mb:
+        import resource
+        limit = int(limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+if __name__ == "__main__":
+    try:
+        limit_memory()
+        mode = os.environ.get("RADICAL_MODE", "serve")
+        stdio = mode != "legacy" and os.environ.get("RADICAL_TRANSPORT") == "stdio"
+        streams = claim_stdio() if stdio else None
+        handler_func = load_handler(os.environ.get("RADICAL_HANDLER", "main.handle"))
+        if mode == "legacy":
+            run_once(handler_func)
+        elif stdio:
+            serve_stdio(handler_func, *streams)
+        else:
+            serve_socket(handler_func, int(os.environ.get("RADICAL_PORT", "8080")))
+    except Exception as e:
+        print(f"Wrapper Error: {e}", file=sys.stderr)
+        exit(1)
+"""
+
+
+# Serializes concurrent builds of the same image.
+_build_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _digest(parts: Dict[str, object]) -> str:
+    """Hashes a dictionary of build inputs in a canonical form."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def base_image_digest(runtime: str, dependencies: List[str]) -> str:
+    """
+    Computes the digest of the shared base image for a runtime and dependency set.
+
+    The wrapper and protocol sources are part of the digest, so a platform
+    upgrade produces new base images instead of reusing stale ones.
+    """
+    with open(PROTOCOL_MODULE) as f:
+        protocol_source = f.read()
+    return _digest({
+        "runtime": runtime,
+        "dependencies": sorted(set(dependencies)),
+        "wrapper": WRAPPER_SCRIPT,
+        "protocol": protocol_source,
+    })
+
+
+def function_image_digest(function_data: schemas.FunctionCreate) -> str:
+    """Computes the content digest of a function's image."""
+    return _digest({
+        "base": base_image_digest(function_data.runtime, function_data.dependencies or []),
+        "handler": function_data.handler,
+        "code": function_data.code,
+    })
+
+
+def image_uris(function_data: schemas.FunctionCreate) -> Tuple[str, str]:
+    """Returns the digest-tagged URIs of a function's base image and its own image."""
+    base_digest = base_image_digest(function_data.runtime, function_data.dependencies or [])
+    base_uri = f"{settings.container_registry}/radical-base:{base_digest[:settings.image_tag_length]}"
+    function_digest = function_image_digest(function_data)
+    image_uri = f"{settings.container_registry}/{function_data.name}:{function_digest[:settings.image_tag_length]}"
+    return base_uri, image_uri
+
+
+@functools.lru_cache(maxsize=None)
+def _docker_client() -> docker.DockerClient:
+    """Returns the shared Docker client. Creating it queries the daemon, so call it off the event loop."""
+    return docker.from_env()
+
+
+def _image_exists(client: docker.DockerClient, image_uri: str) -> bool:
+    try:
+        client.images.get(image_uri)
+        return True
+    except docker.errors.ImageNotFound:
+        return False
+
+
+def _build(client: docker.DockerClient, image_uri: str, files: Dict[str, str]) -> None:
+    """Writes a temporary build context containing the given files and builds it."""
+    with metrics.span("build_context"):
+        build_path = tempfile.mkdtemp()
+        print(f"Builder: Created temporary build context at {build_path}")
+        for filename, content in files.items():
+            with open(os.path.join(build_path, filename), "w") as f:
+                f.write(content)
+    try:
+        print(f"Builder: Building image '{image_uri}'...")
+        with metrics.span("image_build"):
+            client.images.build(path=build_path, tag=image_uri, rm=True)
+
+        # Uncomment the following lines to push to a real registry
+        # print(f"Builder: Pushing image '{image_uri}'...")
+        # for line in client.images.push(image_uri, stream=True, decode=True):
+        #     print(line)
+
+    finally:
+        print(f"Builder: Cleaning up build context at {build_path}")
+        shutil.rmtree(build_path)
+
+
+async def _build_once(client: docker.DockerClient, image_uri: str, files: Dict[str, str]) -> None:
+    """Builds an image unless it already exists, never building the same image twice at once."""
+    lock = _build_locks.setdefault(image_uri, asyncio.Lock())
+    async with lock:
+        if await asyncio.to_thread(_image_exists, client, image_uri):
+            print(f"Builder: Reusing cached image '{image_uri}'.")
+            return
+        await asyncio.to_thread(_build, client, image_uri, files)
+
+
+async def build_image_from_code(function_data: schemas.FunctionCreate) -> str:
+    """
+    Creates a container image from function source code.
+
+    Args:
+        function_data: The function's metadata, including source code.
+
+    Returns:
+        The digest-tagged URI of the function's container image.
+    """
+    client = await asyncio.to_thread(_docker_client)
+    base_uri, image_uri = image_uris(function_data)
+
+    if await asyncio.to_thread(_image_exists, client, image_uri):
+        print(f"Builder: Image '{image_uri}' is up to date.")
+        return image_uri
+
+    with open(PROTOCOL_MODULE) as f:
+        protocol_source = f.read()
+    dependencies = sorted(set(function_data.dependencies or []))
+    await _build_once(client, base_uri, {
+        "requirements.txt": "\n".join(dependencies) + "\n",
+        "wrapper.py": WRAPPER_SCRIPT,
+        "radical_protocol.py": protocol_source,
+        "Dockerfile": f"""
+        FROM {function_data.runtime}
+        WORKDIR /app
+        COPY requirements.txt .
+        {"RUN pip install --no-cache-dir -r requirements.txt" if dependencies else ""}
+        COPY wrapper.py radical_protocol.py ./
+        CMD ["python", "wrapper.py"]
+        """,
+    })
+
+    module_name, _ = function_data.handler.split('.')
+    await _build_once(client, image_uri, {
+        f"{module_name}.py": function_data.code,
+        "Dockerfile": f"""
+        FROM {base_uri}
+        COPY {module_name}.py .
+        """,
+    })
+    return image_uri
@@ -0,0 +1,147 @@
+"""
+The framed request/response protocol spoken between the orchestrator and
+function containers.
+
+Every message is a frame made of a fixed header, a small JSON metadata
+object and a raw body:
+
+    +--------+-------------+-------------+-----------+-------------+
+    | kind   | meta length | body length | meta      | body        |
+    | 1 byte | 4 bytes     | 4 bytes     | JSON      | raw bytes   |
+    +--------+-------------+-------------+-----------+-------------+
+
+Payloads and results travel in the body untouched, so large and binary
+values are never base64-encoded or squeezed into environment variables,
+and nothing is recovered by scraping container logs.
+
+This module is copied verbatim into every function image next to the
+wrapper, so it must only depend on the standard library and stay
+compatible with the oldest Python runtime we build for.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Frame kinds.
+INVOKE = 1
+RESULT = 2
+ERROR = 3
+SHUTDOWN = 4
+
+# Body content types, recorded under the 'content_type' metadata key.
+CONTENT_JSON = "json"
+CONTENT_BYTES = "bytes"
+
+HEADER = struct.Struct(">BII")
+MAX_FRAME_SIZE = 1 << 31
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed frame."""
+
+
+class Frame(NamedTuple):
+    """A decoded protocol frame."""
+    kind: int
+    meta: Dict[str, Any]
+    body: bytes
+
+
+def encode_value(value: Any) -> Tuple[str, bytes]:
+    """Encodes a payload or result, passing bytes through without copying them into JSON."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return CONTENT_BYTES, bytes(value)
+    return CONTENT_JSON, json.dumps(value).encode()
+
+
+def decode_value(content_type: str, body: bytes) -> Any:
+    """Reverses encode_value."""
+    if content_type == CONTENT_BYTES:
+        return body
+    return json.loads(body) if body else None
+
+
+def frame_parts(kind: int, meta: Optional[Dict[str, Any]] = None, body: bytes = b"") -> List[bytes]:
+    """
+    Builds the byte strings that make up a frame.
+
+    The parts are returned separately so that large bodies can be written
+    to a stream without first being concatenated with the header.
+    """
+    meta_bytes = json.dumps(meta or {}).encode()
+    if len(meta_bytes) + len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError("Frame exceeds the maximum frame size.")
+    return [HEADER.pack(kind, len(meta_bytes), len(body)), meta_bytes, body]
+
+
+def _parse(kind: int, meta_bytes: bytes, body: bytes) -> Frame:
+    try:
+        meta = json.loads(meta_bytes) if meta_bytes else {}
+    except ValueError as e:
+        raise ProtocolError(f"Invalid frame metadata: {e}")
+    return Frame(kind, meta, body)
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            raise ProtocolError("Connection closed in the middle of a frame.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(stream) -> Optional[Frame]:
+    """
+    Reads one frame from a blocking binary stream.
+
+    Returns:
+        The frame, or None if the stream was closed between frames.
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        header += _read_exactly(stream, HEADER.size - len(header))
+    kind, meta_len, body_len = HEADER.unpack(header)
+    return _parse(kind, _read_exactly(stream, meta_len), _read_exactly(stream, body_len))
+
+
+def write_frame(stream, kind: int, meta: Optional[Dict[str, Any]] = None, body: bytes = b"") -> None:
+    """Writes one frame to a blocking binary stream and flushes it."""
+    for part in frame_parts(kind, meta, body):
+        stream.write(part)
+    stream.flush()
+
+
+async def read_frame_async(reader) -> Optional[Frame]:
+    """
+    Reads one frame from an asyncio StreamReader.
+
+    Returns:
+        The frame, or None if the stream was closed between frames.
+    """
+    import asyncio
+
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ProtocolError("Connection closed in the middle of a frame.")
+    kind, meta_len, body_len = HEADER.unpack(header)
+    try:
+        meta_bytes = await reader.readexactly(meta_len)
+        body = await reader.readexactly(body_len)
+    except asyncio.IncompleteReadError:
+        raise ProtocolError("Connection closed in the middle of a frame.")
+    return _parse(kind, meta_bytes, body)
+
+
+async def write_frame_async(writer, kind: int, meta: Optional[Dict[str, Any]] = None, body: bytes = b"") -> None:
+    """Writes one frame to an asyncio StreamWriter."""
+    writer.writelines(frame_parts(kind, meta, body))
+    await writer.drain()
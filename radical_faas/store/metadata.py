@@ -0,0 +1,483 @@
+"""
+Manages the persistence of function metadata using a SQLite database.
+
+This module provides an interface for the controller to create, read, and
+update records for deployed functions, ensuring that the platform's state
+is saved between restarts.
+
+The database runs in WAL mode so that readers never wait for writers.
+Queries run on a small pool of reader threads, each with its own
+connection, and all writes go through a single writer thread, so no
+database call blocks the event loop. Function records are served from an
+in-process read-through cache that is invalidated whenever a function is
+redeployed, and invocation records are buffered and written in batches.
+Results evicted from the in-memory result cache can be spilled to the
+'results' table.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, List, Tuple
+
+from ..config import settings
+
+
+# Deployment states recorded in the 'builds' table.
+BUILD_QUEUED = "queued"
+BUILD_BUILDING = "building"
+BUILD_READY = "ready"
+BUILD_FAILED = "failed"
+
+_local = threading.local()
+_read_executor = ThreadPoolExecutor(max_workers=settings.db_read_workers, thread_name_prefix="store-read")
+_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-write")
+
+# Read-through cache of function records. The generation counter of a name
+# is bumped on every write, so a lookup that raced a redeploy does not put
+# the stale row it read back into the cache.
+_function_cache: Dict[str, Dict[str, Any]] = {}
+_function_generations: Dict[str, int] = {}
+
+# Invocation records waiting to be written by the flusher task.
+_pending_invocations: List[Tuple[Any, ...]] = []
+_flusher: Optional[asyncio.Task] = None
+_flush_needed: Optional[asyncio.Event] = None
+
+
+def _get_db_connection() -> sqlite3.Connection:
+    """Creates or returns the calling thread's database connection."""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        conn = sqlite3.connect(settings.db_file, timeout=settings.db_busy_timeout_seconds)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL is durable across application crashes and only
+        # syncs at checkpoints, which keeps commits cheap.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.connection = conn
+    return conn
+
+
+async def _read(query: Callable[[sqlite3.Connection], Any]) -> Any:
+    """Runs a read-only query on a reader thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_read_executor, lambda: query(_get_db_connection()))
+
+
+async def _write(statement: Callable[[sqlite3.Connection], Any]) -> Any:
+    """Runs a write on the writer thread and commits it."""
+    def run() -> Any:
+        conn = _get_db_connection()
+        with conn:
+            return statement(conn)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_write_executor, run)
+
+
+def _add_missing_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> None:
+    """Adds columns introduced after a database file was first created."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row["name"] for row in cursor.fetchall()}
+    for column, definition in columns.items():
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def init_db():
+    """Initializes the database and creates the 'functions', 'builds', 'invocations' and 'results' tables."""
+    print("Store: Initializing database...")
+    conn = _get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS functions (
+            name TEXT PRIMARY KEY NOT NULL,
+            image_uri TEXT NOT NULL,
+            handler TEXT NOT NULL,
+            runtime TEXT NOT NULL,
+            pool_size INTEGER NOT NULL DEFAULT 0,
+            pool_min_size INTEGER NOT NULL DEFAULT 0,
+            executor TEXT NOT NULL DEFAULT 'kubernetes',
+            code TEXT,
+            timeout_seconds REAL,
+            memory_limit_mb INTEGER,
+            cacheable INTEGER NOT NULL DEFAULT 0,
+            cache_ttl_seconds REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    _add_missing_columns(cursor, "functions", {
+        "pool_size": "INTEGER NOT NULL DEFAULT 0",
+        "pool_min_size": "INTEGER NOT NULL DEFAULT 0",
+        "executor": "TEXT NOT NULL DEFAULT 'kubernetes'",
+        "code": "TEXT",
+        "timeout_seconds": "REAL",
+        "memory_limit_mb": "INTEGER",
+        "cacheable": "INTEGER NOT NULL DEFAULT 0",
+        "cache_ttl_seconds": "REAL",
+    })
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS builds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            function_name TEXT NOT NULL,
+            spec TEXT NOT NULL,
+            status TEXT NOT NULL,
+            image_uri TEXT,
+            error TEXT,
+            queued_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            duration_seconds REAL
+        );
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS builds_by_function ON builds (function_name, id)"
+    )
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS invocations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            function_name TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            duration_ms REAL NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT
+        );
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS invocations_by_function ON invocations (function_name, started_at)"
+    )
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY NOT NULL,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS results_by_expiry ON results (expires_at)")
+    conn.commit()
+    print(f"Store: Database initialized at '{settings.db_file}'.")
+
+
+def invalidate_function_cache(name: Optional[str] = None) -> None:
+    """Drops one function, or every function, from the read-through cache."""
+    names = [name] if name is not None else list(_function_generations)
+    for n in names:
+        _function_generations[n] = _function_generations.get(n, 0) + 1
+        _function_cache.pop(n, None)
+
+
+async def save_function_details(
+    name: str,
+    image_uri: str,
+    handler: str,
+    runtime: str,
+    pool_size: int = 0,
+    pool_min_size: int = 0,
+    executor: str = "kubernetes",
+    code: Optional[str] = None,
+    timeout_seconds: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    cacheable: bool = False,
+    cache_ttl_seconds: Optional[float] = None,
+) -> None:
+    """
+    Saves or updates a function's details in the database.
+
+    Args:
+        name: The unique name of the function.
+        image_uri: The URI of the container image for the function.
+        handler: The function's entry point (e.g., 'main.handle').
+        runtime: The function's language runtime (e.g., 'python3.9').
+        pool_size: Maximum number of warm workers (0 disables the pool).
+        pool_min_size: Number of warm workers kept alive while idle.
+        executor: The name of the executor the function runs on.
+        code: The function's source code.
+        timeout_seconds: Seconds an invocation may run before it is killed.
+        memory_limit_mb: Memory limit for each worker, in MiB.
+        cacheable: Whether results for identical payloads may be reused.
+        cache_ttl_seconds: How long a cached result is reused, if not the default.
+    """
+    print(f"Store: Saving details for function '{name}'.")
+
+    def save(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO functions (name, image_uri, handler, runtime, pool_size, pool_min_size, "
+            "executor, code, timeout_seconds, memory_limit_mb, cacheable, cache_ttl_seconds) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, image_uri, handler, runtime, pool_size, pool_min_size,
+             executor, code, timeout_seconds, memory_limit_mb, cacheable, cache_ttl_seconds)
+        )
+
+    invalidate_function_cache(name)
+    try:
+        await _write(save)
+    finally:
+        invalidate_function_cache(name)
+
+
+async def get_function_details(function_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves the details for a single function, from the cache when possible.
+
+    Args:
+        function_name: The name of the function to retrieve.
+
+    Returns:
+        A dictionary containing the function's details, or None if not found.
+    """
+    cached = _function_cache.get(function_name)
+    if cached is not None:
+        return dict(cached)
+
+    generation = _function_generations.get(function_name, 0)
+
+    def query(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT * FROM functions WHERE name = ?", (function_name,)).fetchone()
+        return dict(row) if row else None
+
+    details = await _read(query)
+    if details is not None and _function_generations.get(function_name, 0) == generation:
+        _function_cache[function_name] = details
+        return dict(details)
+    return details
+
+
+async def list_all_functions() -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of all deployed functions.
+
+    Returns:
+        A list of dictionaries, where each dictionary represents a function.
+    """
+    def query(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        return [dict(row) for row in conn.execute("SELECT * FROM functions").fetchall()]
+
+    return await _read(query)
+
+
+async def enqueue_build(function_name: str, spec: str) -> Tuple[int, bool]:
+    """
+    Adds a deployment to the build queue.
+
+    A deploy of a function that already has a build waiting in the queue
+    replaces that build's spec instead of queueing a second build.
+
+    Args:
+        function_name: The name of the function being deployed.
+        spec: The JSON-serialized FunctionCreate request.
+
+    Returns:
+        The build's ID, and whether a new build was queued.
+    """
+    def enqueue(conn: sqlite3.Connection) -> Tuple[int, bool]:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT id FROM builds WHERE function_name = ? AND status = ? ORDER BY id DESC LIMIT 1",
+            (function_name, BUILD_QUEUED)
+        )
+        row = cursor.fetchone()
+        if row:
+            cursor.execute(
+                "UPDATE builds SET spec = ?, queued_at = ? WHERE id = ? AND status = ?",
+                (spec, time.time(), row["id"], BUILD_QUEUED)
+            )
+            if cursor.rowcount == 1:
+                return row["id"], False
+
+        cursor.execute(
+            "INSERT INTO builds (function_name, spec, status, queued_at) VALUES (?, ?, ?, ?)",
+            (function_name, spec, BUILD_QUEUED, time.time())
+        )
+        return cursor.lastrowid, True
+
+    return await _write(enqueue)
+
+
+async def claim_build(build_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Marks a queued build as building.
+
+    Returns:
+        The build record, or None if the build was no longer queued.
+    """
+    def claim(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        cursor = conn.execute(
+            "UPDATE builds SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+            (BUILD_BUILDING, time.time(), build_id, BUILD_QUEUED)
+        )
+        if cursor.rowcount != 1:
+            return None
+        return dict(conn.execute("SELECT * FROM builds WHERE id = ?", (build_id,)).fetchone())
+
+    return await _write(claim)
+
+
+async def finish_build(build_id: int, image_uri: Optional[str] = None, error: Optional[str] = None) -> None:
+    """
+    Records the outcome of a build and how long it took.
+
+    Args:
+        build_id: The ID of the build.
+        image_uri: The built image, if the build succeeded.
+        error: The failure reason, if the build failed.
+    """
+    finished_at = time.time()
+
+    def finish(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "UPDATE builds SET status = ?, image_uri = ?, error = ?, finished_at = ?, "
+            "duration_seconds = ? - started_at WHERE id = ?",
+            (BUILD_FAILED if error else BUILD_READY, image_uri, error, finished_at, finished_at, build_id)
+        )
+
+    await _write(finish)
+
+
+async def get_build(build_id: int) -> Optional[Dict[str, Any]]:
+    """Retrieves a single build record."""
+    def query(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        row = conn.execute("SELECT * FROM builds WHERE id = ?", (build_id,)).fetchone()
+        return dict(row) if row else None
+
+    return await _read(query)
+
+
+async def get_latest_build(function_name: str) -> Optional[Dict[str, Any]]:
+    """Retrieves the most recent build of a function, which reflects its deployment state."""
+    def query(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT * FROM builds WHERE function_name = ? ORDER BY id DESC LIMIT 1",
+            (function_name,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    return await _read(query)
+
+
+async def requeue_unfinished_builds() -> List[int]:
+    """
+    Returns builds that were queued or interrupted when the server stopped.
+
+    Builds that were in progress are moved back to the queue so that they
+    are retried from scratch.
+    """
+    def requeue(conn: sqlite3.Connection) -> List[int]:
+        conn.execute(
+            "UPDATE builds SET status = ?, started_at = NULL WHERE status = ?",
+            (BUILD_QUEUED, BUILD_BUILDING)
+        )
+        rows = conn.execute("SELECT id FROM builds WHERE status = ? ORDER BY id", (BUILD_QUEUED,))
+        return [row["id"] for row in rows.fetchall()]
+
+    return await _write(requeue)
+
+
+async def get_cached_result(key: str) -> Optional[Tuple[str, float]]:
+    """
+    Looks up a spilled result.
+
+    Args:
+        key: The result's cache key.
+
+    Returns:
+        The result as JSON and its expiry (Unix time), or None if it was
+        never spilled or has expired.
+    """
+    def query(conn: sqlite3.Connection) -> Optional[Tuple[str, float]]:
+        row = conn.execute(
+            "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return (row["value"], row["expires_at"]) if row else None
+
+    return await _read(query)
+
+
+async def save_cached_results(results: List[Tuple[str, str, float]]) -> None:
+    """
+    Spills results evicted from memory, dropping any that have since expired.
+
+    Args:
+        results: (key, value as JSON, expiry as Unix time) for each result.
+    """
+    def save(conn: sqlite3.Connection) -> None:
+        conn.executemany("INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)", results)
+        conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+
+    await _write(save)
+
+
+def record_invocation(
+    function_name: str,
+    started_at: float,
+    duration_ms: float,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Buffers an invocation record to be written with the next batch.
+
+    This never touches the database itself, so it is safe to call on the
+    invocation path. Records are lost if the process dies before a flush.
+
+    Args:
+        function_name: The name of the invoked function.
+        started_at: When the invocation started (Unix time).
+        duration_ms: How long the invocation took end to end.
+        error: The failure reason, if the invocation failed.
+    """
+    _pending_invocations.append(
+        (function_name, started_at, duration_ms, "error" if error else "success", error)
+    )
+    if len(_pending_invocations) >= settings.db_write_batch_size and _flush_needed is not None:
+        _flush_needed.set()
+
+
+async def flush_invocations() -> None:
+    """Writes all buffered invocation records in a single transaction."""
+    global _pending_invocations
+    if not _pending_invocations:
+        return
+    batch, _pending_invocations = _pending_invocations, []
+
+    def insert(conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO invocations (function_name, started_at, duration_ms, status, error) "
+            "VALUES (?, ?, ?, ?, ?)",
+            batch
+        )
+
+    await _write(insert)
+
+
+async def _flush_periodically() -> None:
+    """Flushes invocation records when a batch fills up or the flush interval passes."""
+    while True:
+        try:
+            await asyncio.wait_for(_flush_needed.wait(), settings.db_flush_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        _flush_needed.clear()
+        try:
+            await flush_invocations()
+        except sqlite3.Error as e:
+            print(f"Store: Failed to write invocation records: {e}")
+
+
+async def start_writer() -> None:
+    """Starts the background task that writes batched invocation records."""
+    global _flusher, _flush_needed
+    _flush_needed = asyncio.Event()
+    _flusher = asyncio.create_task(_flush_periodically())
+
+
+async def stop_writer() -> None:
+    """Stops the background writer and flushes whatever is still buffered."""
+    if _flusher is not None:
+        _flusher.cancel()
+        try:
+            await _flusher
+        except asyncio.CancelledError:
+            pass
+    await flush_invocations()
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+from radical_faas.config import settings
+from radical_faas.store import metadata
+
+
+@pytest.fixture(scope="session")
+def _database(tmp_path_factory):
+    # Store connections are cached per thread, so the whole session shares one database file.
+    settings.db_file = os.path.join(tmp_path_factory.mktemp("store"), "metadata.db")
+    metadata.init_db()
+
+
+@pytest.fixture
+def store(_database):
+    """A metadata store with an empty function cache."""
+    metadata.invalidate_function_cache()
+    yield metadata
+    metadata.invalidate_function_cache()
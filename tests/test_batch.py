@@ -0,0 +1,143 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+
+import pytest
+
+from radical_faas.controller import executors, orchestrator
+from radical_faas.controller.executors.base import Executor, LaneLost
+from radical_faas.controller.pool import FunctionPool
+from radical_faas.controller.worker import FunctionError, Worker
+
+
+class StubExecutor(Executor):
+    """Runs payloads in process; a lane's worker is lost when it meets a 'crash' payload."""
+
+    name = "stub"
+
+    def __init__(self, lost_lanes=None):
+        super().__init__()
+        self.lost_lanes = lost_lanes
+        self.lanes = 0
+        self.lost = 0
+
+    async def invoke(self, function_details, payload):
+        await asyncio.sleep(random.random() / 200)
+        if payload == "fail":
+            raise FunctionError("handler failed")
+        return payload * 2
+
+    @asynccontextmanager
+    async def lane(self, function_details):
+        self.lanes += 1
+
+        async def invoke(payload):
+            if payload == "crash" and (self.lost_lanes is None or self.lost < self.lost_lanes):
+                self.lost += 1
+                raise LaneLost("worker went away")
+            return await self.invoke(function_details, payload)
+
+        yield invoke
+
+
+class SlowWorker(Worker):
+    async def invoke(self, payload):
+        await asyncio.sleep(1 if payload == "slow" else 0)
+        return payload * 2, {}
+
+
+class SlowPool(FunctionPool):
+    async def _spawn(self, name):
+        return SlowWorker(name)
+
+    async def _destroy(self, worker):
+        pass
+
+
+class PooledExecutor(Executor):
+    """Shares a warm pool between batch lanes, like the local executor does."""
+
+    name = "stub"
+
+    async def _create_pool(self, function_details):
+        return SlowPool(function_details["name"], max_size=2, timeout=0.05)
+
+
+@pytest.fixture
+def stub(store):
+    def deploy(executor_class=StubExecutor, **kwargs):
+        executor = executor_class(**kwargs)
+        executors.register_executor(executor)
+        asyncio.run(store.save_function_details(
+            name="batched", image_uri="stub://batched", handler="main.handle", runtime="python:3.11", executor="stub",
+        ))
+        return executor
+
+    yield deploy
+    executors._executors.pop("stub", None)
+
+
+async def _collect(payloads, workers, ordered=True):
+    stream = await orchestrator.run_batch("batched", list(payloads), workers, ordered)
+    return [item async for item in stream]
+
+
+def test_results_keep_input_order(stub):
+    stub()
+    items = asyncio.run(_collect(range(50), workers=4))
+    assert [item["index"] for item in items] == list(range(50))
+    assert [item["result"] for item in items] == [n * 2 for n in range(50)]
+
+
+def test_unordered_results_cover_every_input(stub):
+    stub()
+    items = asyncio.run(_collect(range(50), workers=4, ordered=False))
+    assert sorted(item["index"] for item in items) == list(range(50))
+
+
+def test_handler_errors_are_reported_per_item(stub):
+    executor = stub()
+    items = asyncio.run(_collect([1, "fail", 3], workers=1))
+    assert [item["status"] for item in items] == ["success", "error", "success"]
+    assert items[1]["error"] == "handler failed"
+    assert executor.lanes == 1
+
+
+def test_lost_lane_leaves_its_remaining_items_to_the_others(stub):
+    executor = stub(lost_lanes=1)
+    payloads = list(range(10)) + ["crash"] + list(range(10, 30))
+    items = asyncio.run(_collect(payloads, workers=3))
+
+    assert [item["index"] for item in items] == list(range(len(payloads)))
+    assert items[10]["status"] == "error"
+    assert all(item["status"] == "success" for i, item in enumerate(items) if i != 10)
+    assert executor.lost == 1
+
+
+def test_items_fail_once_every_lane_is_lost(stub):
+    stub()
+    items = asyncio.run(_collect(["crash", "crash", 1, 2], workers=2))
+    assert [item["index"] for item in items] == [0, 1, 2, 3]
+    assert all(item["status"] == "error" for item in items)
+    assert items[3]["error"] == "worker went away"
+
+
+def test_unknown_function_is_rejected(store):
+    with pytest.raises(ValueError):
+        asyncio.run(orchestrator.run_batch("missing", [], 1))
+
+
+def test_item_failures_on_a_shared_pool_do_not_end_the_lane(stub):
+    executor = stub(PooledExecutor)
+
+    async def main():
+        try:
+            return await _collect(["slow", "slow"] + list(range(8)), workers=2)
+        finally:
+            await executor.shutdown()
+
+    items = asyncio.run(main())
+
+    assert [item["status"] for item in items] == ["error"] * 2 + ["success"] * 8
+    assert "timed out" in items[0]["error"]
+    assert [item["result"] for item in items[2:]] == [n * 2 for n in range(8)]
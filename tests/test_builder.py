@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from radical_faas.api import schemas
+from radical_faas.controller import executors, orchestrator
+from radical_faas.controller.executors.base import Executor
+from radical_faas.runtime import builder
+
+
+def _function(**overrides):
+    spec = {
+        "name": "digested", "runtime": "python:3.11-slim", "handler": "main.handle",
+        "code": "def handle(payload):\n    return payload\n", "dependencies": ["requests", "numpy"],
+    }
+    return schemas.FunctionCreate(**{**spec, **overrides})
+
+
+class PreparingExecutor(Executor):
+    """Prepares content-addressed URIs without building anything, and counts pool releases."""
+
+    name = "preparing"
+
+    def __init__(self):
+        super().__init__()
+        self.released = []
+
+    async def prepare(self, function_data):
+        return f"preparing://{function_data.name}@{builder.function_image_digest(function_data)[:16]}"
+
+    async def release(self, function_name):
+        self.released.append(function_name)
+
+
+def test_digests_are_stable():
+    assert builder.function_image_digest(_function()) == builder.function_image_digest(_function())
+    assert builder.image_uris(_function()) == builder.image_uris(_function())
+
+
+def test_dependency_order_and_duplicates_do_not_change_the_base_image():
+    reordered = _function(dependencies=["numpy", "requests", "numpy"])
+    assert builder.base_image_digest("python:3.11-slim", ["requests", "numpy"]) == \
+        builder.base_image_digest("python:3.11-slim", ["numpy", "requests", "numpy"])
+    assert builder.image_uris(_function()) == builder.image_uris(reordered)
+
+
+def test_code_changes_only_the_function_image():
+    base, image = builder.image_uris(_function())
+    new_base, new_image = builder.image_uris(_function(code="def handle(payload):\n    return 1\n"))
+    assert new_base == base
+    assert new_image != image
+
+
+@pytest.mark.parametrize("change", [{"runtime": "python:3.12-slim"}, {"dependencies": ["requests"]}])
+def test_runtime_and_dependencies_change_the_base_image(change):
+    assert builder.image_uris(_function(**change))[0] != builder.image_uris(_function())[0]
+
+
+def test_identical_deploy_is_short_circuited(store, monkeypatch):
+    executor = PreparingExecutor()
+    executors.register_executor(executor)
+    saves = []
+    save = store.save_function_details
+
+    async def counting_save(**kwargs):
+        saves.append(kwargs["image_uri"])
+        await save(**kwargs)
+
+    monkeypatch.setattr(store, "save_function_details", counting_save)
+
+    async def main():
+        first = await orchestrator.deploy_new_function(_function())
+        again = await orchestrator.deploy_new_function(_function())
+        resized = await orchestrator.deploy_new_function(_function(pool_size=2))
+        return first, again, resized
+
+    monkeypatch.setattr(orchestrator.settings, "default_executor", "preparing")
+    try:
+        first, again, resized = asyncio.run(main())
+    finally:
+        executors._executors.pop("preparing", None)
+
+    assert first == again == resized
+    # Only the first deploy and the one changing a setting touch the store and the pools.
+    assert saves == [first, first]
+    assert executor.released == ["digested", "digested"]
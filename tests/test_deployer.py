@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from radical_faas.api import schemas
+from radical_faas.controller import deployer, orchestrator
+from radical_faas.store import metadata
+
+
+def _function(name, **overrides):
+    return schemas.FunctionCreate(
+        name=name, runtime="python:3.11-slim", handler="main.handle", code="def handle(p):\n    return p\n",
+        **overrides,
+    )
+
+
+@pytest.fixture(autouse=True)
+def queue(monkeypatch):
+    """Builds queued by a test, which no build worker takes off."""
+    queue = asyncio.Queue()
+    monkeypatch.setattr(deployer, "_queue", queue)
+    return queue
+
+
+def test_deploys_of_a_queued_build_are_merged(store, queue):
+    async def main():
+        first = await deployer.submit_deployment(_function("merged"))
+        second = await deployer.submit_deployment(_function("merged", pool_size=3))
+        await store.claim_build(first["id"])
+        third = await deployer.submit_deployment(_function("merged", pool_size=4))
+        return first, second, third
+
+    first, second, third = asyncio.run(main())
+    assert second["id"] == first["id"]
+    assert json.loads(second["spec"])["pool_size"] == 3
+    # A build that has started is never rewritten; the next deploy queues its own.
+    assert third["id"] != first["id"]
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [first["id"], third["id"]]
+
+
+def test_interrupted_builds_are_requeued(store):
+    async def main():
+        building, _ = await store.enqueue_build("interrupted", "{}")
+        await store.claim_build(building)
+        queued, _ = await store.enqueue_build("waiting", "{}")
+        finished, _ = await store.enqueue_build("finished", "{}")
+        await store.claim_build(finished)
+        await store.finish_build(finished, image_uri="img@1")
+        return building, queued, finished, await store.requeue_unfinished_builds(), await store.get_build(building)
+
+    building, queued, finished, requeued, build = asyncio.run(main())
+    assert building in requeued and queued in requeued
+    assert finished not in requeued
+    assert build["status"] == metadata.BUILD_QUEUED
+    assert build["started_at"] is None
+
+
+def test_long_poll_returns_when_the_build_finishes(store, monkeypatch):
+    async def deploy(function_data):
+        await asyncio.sleep(0.1)
+        return "img@polled"
+
+    monkeypatch.setattr(orchestrator, "deploy_new_function", deploy)
+
+    async def main():
+        build = await deployer.submit_deployment(_function("polled"))
+        immediate = await deployer.wait_for_deployment("polled")
+        builder = asyncio.create_task(deployer._run_build(build["id"]))
+        started = asyncio.get_running_loop().time()
+        finished = await deployer.wait_for_deployment("polled", timeout=5)
+        waited = asyncio.get_running_loop().time() - started
+        await builder
+        return immediate, finished, waited
+
+    immediate, finished, waited = asyncio.run(main())
+    assert immediate["status"] == metadata.BUILD_QUEUED
+    assert finished["status"] == metadata.BUILD_READY
+    assert finished["image_uri"] == "img@polled"
+    assert finished["duration_seconds"] >= 0
+    assert waited < 1
+
+
+def test_long_poll_gives_up_after_its_timeout(store):
+    async def main():
+        await store.enqueue_build("stalled", "{}")
+        return await deployer.wait_for_deployment("stalled", timeout=0.05)
+
+    assert asyncio.run(main())["status"] == metadata.BUILD_QUEUED
+
+
+def test_unknown_function_has_no_deployment(store):
+    assert asyncio.run(deployer.wait_for_deployment("never-deployed", timeout=1)) is None
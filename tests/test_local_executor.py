@@ -0,0 +1,105 @@
+import asyncio
+import shutil
+
+import pytest
+from pydantic import ValidationError
+
+from radical_faas.api import schemas
+from radical_faas.config import settings
+from radical_faas.controller import executors, orchestrator
+from radical_faas.controller.executors import local
+from radical_faas.controller.worker import FunctionError
+
+CODE = '''
+import os
+
+def handle(payload):
+    if payload.get("fail"):
+        raise ValueError("bad payload")
+    return {"pid": os.getpid(), "doubled": payload["n"] * 2}
+'''
+
+
+def _function(**overrides):
+    spec = {"name": "local-echo", "runtime": "python:3.11-slim", "handler": "main.handle", "code": CODE}
+    return schemas.FunctionCreate(**{**spec, **overrides})
+
+
+@pytest.fixture
+def functions_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "local_functions_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("name", ["a", "my-function-2", "x" * 49])
+def test_valid_names_are_accepted(name):
+    assert _function(name=name).name == name
+
+
+@pytest.mark.parametrize("name", ["", "-a", "a-", "My-Function", "a_b", "a.b", "../etc", "a/b", "x" * 50])
+def test_invalid_names_are_rejected(name):
+    with pytest.raises(ValidationError):
+        _function(name=name)
+
+
+@pytest.mark.parametrize("handler", ["main", "main.handle.x", "../main.handle", "main/x.handle", "1main.handle"])
+def test_invalid_handlers_are_rejected(handler):
+    with pytest.raises(ValidationError):
+        _function(handler=handler)
+
+
+def test_function_dir_stays_inside_the_functions_dir(functions_dir):
+    assert local._function_dir("local://fn@abc") == str(functions_dir / "fn@abc")
+    for image_uri in ("local://../fn@abc", "local://a/b", "local://", "local://.."):
+        with pytest.raises(ValueError):
+            local._function_dir(image_uri)
+
+
+def test_local_round_trip(store, functions_dir):
+    async def main():
+        try:
+            image_uri = await orchestrator.deploy_new_function(_function(executor="local", pool_size=1))
+            first = await orchestrator.schedule_and_run_function("local-echo", {"n": 21})
+            second = await orchestrator.schedule_and_run_function("local-echo", {"n": 2})
+            with pytest.raises(FunctionError, match="bad payload"):
+                await orchestrator.schedule_and_run_function("local-echo", {"fail": True})
+            third = await orchestrator.schedule_and_run_function("local-echo", {"n": 0})
+            return image_uri, first, second, third
+        finally:
+            await executors.shutdown_all()
+
+    image_uri, first, second, third = asyncio.run(main())
+    assert image_uri.startswith("local://local-echo@")
+    assert (functions_dir / image_uri[len("local://"):] / "main.py").read_text() == CODE
+    assert (first["doubled"], second["doubled"], third["doubled"]) == (42, 4, 0)
+    # One warm process serves every call, including the one whose handler raised.
+    assert first["pid"] == second["pid"] == third["pid"]
+
+
+def test_code_is_rewritten_after_a_restart(store, functions_dir, monkeypatch):
+    started = []
+    start = local.ProcessPool.start
+
+    async def counting_start(pool):
+        started.append(pool.function_name)
+        await start(pool)
+
+    monkeypatch.setattr(local.ProcessPool, "start", counting_start)
+
+    async def main():
+        try:
+            image_uri = await orchestrator.deploy_new_function(_function(executor="local"))
+            shutil.rmtree(functions_dir / image_uri[len("local://"):])
+            await executors.shutdown_all()
+            # Concurrent first calls after the restart share one pool.
+            results = await asyncio.gather(*(
+                orchestrator.schedule_and_run_function("local-echo", {"n": n}) for n in range(3)
+            ))
+            return image_uri, results
+        finally:
+            await executors.shutdown_all()
+
+    image_uri, results = asyncio.run(main())
+    assert [r["doubled"] for r in results] == [0, 2, 4]
+    assert started == ["local-echo"]
+    assert (functions_dir / image_uri[len("local://"):] / "main.py").exists()
@@ -0,0 +1,52 @@
+import asyncio
+
+from radical_faas.store import metadata
+
+
+async def _deploy(name, image_uri):
+    await metadata.save_function_details(name=name, image_uri=image_uri, handler="main.handle", runtime="python:3.11")
+
+
+def test_lookups_are_served_from_the_cache(store, monkeypatch):
+    async def main():
+        await _deploy("cached", "img@1")
+        first = await store.get_function_details("cached")
+        first["image_uri"] = "mutated"
+
+        async def unreachable(query):
+            raise AssertionError("the store was queried")
+
+        monkeypatch.setattr(metadata, "_read", unreachable)
+        return await store.get_function_details("cached")
+
+    assert asyncio.run(main())["image_uri"] == "img@1"
+
+
+def test_lookup_racing_a_redeploy_does_not_cache_the_stale_row(store, monkeypatch):
+    read = metadata._read
+
+    async def main():
+        await _deploy("racy", "img@1")
+        store.invalidate_function_cache("racy")
+        queried, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_read(query):
+            # The stale row has been read; hold it until the redeploy has committed.
+            row = await read(query)
+            queried.set()
+            await release.wait()
+            return row
+
+        monkeypatch.setattr(metadata, "_read", slow_read)
+        lookup = asyncio.create_task(store.get_function_details("racy"))
+        await queried.wait()
+        await _deploy("racy", "img@2")
+        release.set()
+        stale = await lookup
+
+        monkeypatch.setattr(metadata, "_read", read)
+        return stale, await store.get_function_details("racy")
+
+    stale, current = asyncio.run(main())
+    assert stale["image_uri"] == "img@1"
+    assert current["image_uri"] == "img@2"
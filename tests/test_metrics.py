@@ -0,0 +1,159 @@
+import asyncio
+
+import httpx
+import pytest
+
+from radical_faas import metrics
+from radical_faas.api.server import app
+from radical_faas.controller import deployer, executors, orchestrator
+from radical_faas.controller.executors.base import Executor
+
+
+class TimedExecutor(Executor):
+    """Answers in process, timing a fake handler phase."""
+
+    name = "timed"
+
+    async def invoke(self, function_details, payload):
+        with metrics.span("handler"):
+            await asyncio.sleep(0.01)
+        return {"echo": payload}
+
+
+@pytest.fixture
+def registered(monkeypatch):
+    """Keeps metrics created by a test out of the platform's registry."""
+    monkeypatch.setattr(metrics, "_metrics", [])
+    monkeypatch.setattr(metrics, "_collectors", [])
+
+
+def _phase_count(phase, function):
+    for line in metrics.phase_duration.render():
+        if line.startswith(f'{metrics.phase_duration.name}_count{{phase="{phase}",function="{function}"}}'):
+            return int(line.rsplit(" ", 1)[1])
+    return 0
+
+
+def test_counter_renders_one_line_per_label_set(registered):
+    counter = metrics.Counter("test_calls_total", "Calls.", ("function",))
+    counter.inc("b")
+    counter.inc("a", amount=2)
+    counter.inc("b")
+    assert metrics.render() == (
+        "# HELP test_calls_total Calls.\n"
+        "# TYPE test_calls_total counter\n"
+        'test_calls_total{function="a"} 2\n'
+        'test_calls_total{function="b"} 2\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets(registered):
+    histogram = metrics.Histogram("test_seconds", "Durations.", ("phase",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value, "run")
+    assert histogram.render() == [
+        "# HELP test_seconds Durations.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{phase="run",le="0.1"} 1',
+        'test_seconds_bucket{phase="run",le="1.0"} 3',
+        'test_seconds_bucket{phase="run",le="+Inf"} 4',
+        'test_seconds_sum{phase="run"} 6.05',
+        'test_seconds_count{phase="run"} 4',
+    ]
+
+
+def test_label_values_are_escaped(registered):
+    counter = metrics.Counter("test_escaped_total", "Escaped.", ("function",))
+    counter.inc('a"b\\c\nd')
+    assert metrics.render().splitlines()[-1] == 'test_escaped_total{function="a\\"b\\\\c\\nd"} 1'
+
+
+def test_collectors_are_rendered_after_metrics(registered):
+    metrics.register_collector(lambda: ["collected 1"])
+    assert metrics.render() == "collected 1\n"
+
+
+def test_spans_are_attributed_to_the_tracked_function():
+    async def nested():
+        with metrics.span("nested"):
+            pass
+
+    async def main():
+        timings = {}
+        with metrics.track("tracked-fn", timings):
+            with metrics.span("outer"):
+                await asyncio.sleep(0.01)
+            # Tasks and threads started inside the block report into it.
+            await asyncio.create_task(nested())
+            await asyncio.to_thread(metrics.observe, "threaded", 0.5)
+        with metrics.span("untracked"):
+            pass
+        return timings
+
+    timings = asyncio.run(main())
+    assert set(timings) == {"outer", "nested", "threaded"}
+    assert timings["outer"] >= 10
+    assert timings["threaded"] == 500
+    assert _phase_count("outer", "tracked-fn") == 1
+    assert _phase_count("untracked", "") == 1
+
+
+def test_function_context_keeps_the_label_but_not_the_timings():
+    async def main():
+        timings = {}
+        with metrics.track("caller-fn", timings):
+            background = asyncio.create_task(nested(), context=metrics.function_context("background-fn"))
+        await background
+        return timings
+
+    async def nested():
+        with metrics.span("background"):
+            pass
+
+    assert asyncio.run(main()) == {}
+    assert _phase_count("background", "background-fn") == 1
+
+
+async def _idle() -> None:
+    pass
+
+
+def test_unknown_functions_add_no_label_sets(store):
+    async def main():
+        for i in range(3):
+            with pytest.raises(ValueError):
+                await orchestrator.schedule_and_run_function(f"unknown-{i}", {})
+
+    asyncio.run(main())
+    assert "unknown-" not in metrics.render()
+
+
+def test_invoke_returns_timings_on_request(store, monkeypatch):
+    # Builds other tests left in the queue must not be picked up by the server.
+    monkeypatch.setattr(deployer, "start", _idle)
+    monkeypatch.setattr(deployer, "stop", _idle)
+
+    async def main():
+        async with app.router.lifespan_context(app):
+            executors.register_executor(TimedExecutor())
+            await store.save_function_details(
+                name="timed-fn", image_uri="timed://timed-fn", handler="main.handle", runtime="python:3.11",
+                executor="timed",
+            )
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as http:
+                plain = await http.post("/functions/timed-fn/invoke", json={"payload": {"n": 1}})
+                timed = await http.post(
+                    "/functions/timed-fn/invoke", json={"payload": {"n": 1}}, params={"timings": "true"}
+                )
+                scraped = await http.get("http://test/metrics")
+        return plain.json(), timed.json(), scraped.text
+
+    plain, timed, scraped = asyncio.run(main())
+    assert plain["details"] == {"echo": {"n": 1}}
+    assert timed["details"]["result"] == {"echo": {"n": 1}}
+    phases = timed["details"]["timings_ms"]
+    assert set(phases) == {"metadata_lookup", "handler", "total"}
+    assert phases["handler"] >= 10
+    assert phases["total"] >= phases["handler"] + phases["metadata_lookup"]
+    assert 'radical_faas_invocations_total{function="timed-fn",status="success"} 2' in scraped
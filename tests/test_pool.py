@@ -0,0 +1,300 @@
+import asyncio
+
+import pytest
+
+from pydantic import ValidationError
+
+from radical_faas.api import schemas
+from radical_faas.config import settings
+from radical_faas.controller import executors, orchestrator
+from radical_faas.controller.executors.base import Executor
+from radical_faas.controller.pool import FunctionPool, PoolClosedError
+from radical_faas.controller.worker import FunctionError, Worker
+
+
+class FakeWorker(Worker):
+    def __init__(self, name, pool):
+        super().__init__(name)
+        self.pool = pool
+
+    async def invoke(self, payload):
+        self.pool.running += 1
+        self.pool.peak = max(self.pool.peak, self.pool.running)
+        try:
+            if isinstance(payload, dict) and "sleep" in payload:
+                await asyncio.sleep(payload["sleep"])
+            if payload == "raise":
+                raise FunctionError("handler failed")
+            if payload == "block":
+                await self.pool.unblock.wait()
+            if payload == "garbled":
+                raise ValueError("Expecting value: line 1 column 1 (char 0)")
+            return {"worker": self.name, "payload": payload}, {}
+        finally:
+            self.pool.running -= 1
+
+
+class FakePool(FunctionPool):
+    """A pool of in-process workers that records what it started and destroyed."""
+
+    def __init__(self, *args, fail_spawn=False, **kwargs):
+        super().__init__("fake", *args, **kwargs)
+        self.fail_spawn = fail_spawn
+        self.spawned = []
+        self.destroyed = []
+        self.running = 0
+        self.peak = 0
+        self.unblock = asyncio.Event()
+
+    async def _spawn(self, name):
+        await asyncio.sleep(0.01)
+        if self.fail_spawn:
+            raise OSError("no capacity")
+        self.spawned.append(name)
+        return FakeWorker(name, self)
+
+    async def _destroy(self, worker):
+        self.destroyed.append(worker.name)
+
+
+class JobOrPoolExecutor(Executor):
+    """Runs pooled functions on a FakePool and the others as one-off "jobs", like the Kubernetes executor."""
+
+    name = "job-or-pool"
+
+    async def prepare(self, function_data):
+        return f"job-or-pool://{function_data.name}"
+
+    async def invoke(self, function_details, payload):
+        if self.uses_pool(function_details):
+            return await super().invoke(function_details, payload)
+        return {"job": payload}
+
+    def uses_pool(self, function_details):
+        return function_details["pool_size"] > 0
+
+    async def _create_pool(self, function_details):
+        return FakePool(max_size=function_details["pool_size"])
+
+
+def _function(**overrides):
+    spec = {"name": "sized", "runtime": "python:3.11-slim", "handler": "main.handle", "code": "", **overrides}
+    return schemas.FunctionCreate(**spec)
+
+
+async def _started(pool):
+    await pool.start()
+    return pool
+
+
+def test_scales_up_to_max_size_under_load():
+    async def main():
+        pool = await _started(FakePool(max_size=3))
+        results = await asyncio.gather(*(pool.invoke({"sleep": 0.02}) for _ in range(12)))
+        await pool.shutdown()
+        return pool, results
+
+    pool, results = asyncio.run(main())
+    assert len(results) == 12
+    assert len(pool.spawned) == 3
+    assert pool.peak == 3
+    assert {r["worker"] for r in results} == set(pool.spawned)
+
+
+def test_reuses_a_warm_worker_for_sequential_calls():
+    async def main():
+        pool = await _started(FakePool(max_size=4))
+        for i in range(5):
+            await pool.invoke(i)
+        await pool.shutdown()
+        return pool
+
+    pool = asyncio.run(main())
+    assert len(pool.spawned) == 1
+
+
+def test_prewarms_min_size_workers():
+    async def main():
+        pool = await _started(FakePool(max_size=4, min_size=2))
+        await asyncio.sleep(0.05)
+        idle = len(pool._idle)
+        await pool.shutdown()
+        return idle
+
+    assert asyncio.run(main()) == 2
+
+
+def test_evicts_idle_workers_down_to_min_size(monkeypatch):
+    monkeypatch.setattr(settings, "pool_idle_timeout_seconds", 0.05)
+
+    async def main():
+        pool = await _started(FakePool(max_size=3, min_size=1))
+        await asyncio.gather(*(pool.invoke({"sleep": 0.02}) for _ in range(6)))
+        await asyncio.sleep(0.3)
+        remaining = pool._size
+        await pool.shutdown()
+        return pool, remaining
+
+    pool, remaining = asyncio.run(main())
+    assert len(pool.spawned) == 3
+    assert remaining == 1
+    assert len(pool.destroyed) == 3
+
+
+def test_handler_error_keeps_the_worker():
+    async def main():
+        pool = await _started(FakePool(max_size=1))
+        with pytest.raises(FunctionError):
+            await pool.invoke("raise")
+        await pool.invoke("ok")
+        await pool.shutdown()
+        return pool
+
+    pool = asyncio.run(main())
+    assert len(pool.spawned) == 1
+
+
+def test_timed_out_worker_is_discarded():
+    async def main():
+        pool = await _started(FakePool(max_size=1, timeout=0.05))
+        with pytest.raises(TimeoutError):
+            await pool.invoke("block")
+        pool.unblock.set()
+        await pool.invoke("ok")
+        await pool.shutdown()
+        return pool
+
+    pool = asyncio.run(main())
+    assert len(pool.spawned) == 2
+    assert pool.destroyed[0] == pool.spawned[0]
+
+
+def test_cancelled_invocation_discards_its_worker():
+    async def main():
+        pool = await _started(FakePool(max_size=1))
+        running = asyncio.create_task(pool.invoke("block"))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        result = await asyncio.wait_for(pool.invoke("ok"), 1)
+        await pool.shutdown()
+        return pool, result
+
+    pool, result = asyncio.run(main())
+    assert pool.destroyed[0] == pool.spawned[0]
+    assert result["worker"] == pool.spawned[1]
+
+
+def test_undecodable_result_discards_its_worker():
+    async def main():
+        pool = await _started(FakePool(max_size=1))
+        with pytest.raises(ValueError):
+            await pool.invoke("garbled")
+        size = pool._size
+        await asyncio.wait_for(pool.invoke("ok"), 1)
+        await pool.shutdown()
+        return pool, size
+
+    pool, size = asyncio.run(main())
+    assert size == 0
+    assert pool.destroyed[0] == pool.spawned[0]
+
+
+def test_shutdown_fails_queued_invocations():
+    async def main():
+        pool = await _started(FakePool(max_size=1))
+        running = asyncio.create_task(pool.invoke("block"))
+        await asyncio.sleep(0.05)
+        queued = [asyncio.create_task(pool.invoke(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await pool.shutdown()
+        outcomes = await asyncio.wait_for(asyncio.gather(*queued, return_exceptions=True), 1)
+        pool.unblock.set()
+        await running
+        return pool, outcomes
+
+    pool, outcomes = asyncio.run(main())
+    assert all(isinstance(o, PoolClosedError) for o in outcomes)
+    # The busy worker is torn down once it finishes instead of returning to the pool.
+    assert pool.destroyed == pool.spawned
+
+
+def test_failed_startup_is_reported_to_the_caller():
+    async def main():
+        pool = await _started(FakePool(max_size=2, fail_spawn=True))
+        try:
+            await pool.invoke("ok")
+        finally:
+            await pool.shutdown()
+
+    with pytest.raises(RuntimeError, match="no capacity"):
+        asyncio.run(main())
+
+
+def test_pool_without_room_fails_instead_of_waiting():
+    async def main():
+        pool = await _started(FakePool(max_size=0))
+        try:
+            await asyncio.wait_for(pool.invoke("ok"), 1)
+        finally:
+            await pool.shutdown()
+
+    with pytest.raises(RuntimeError, match="no room"):
+        asyncio.run(main())
+
+
+def test_queued_call_follows_a_redeploy_off_the_pool(store):
+    executor = JobOrPoolExecutor()
+
+    async def deploy(pool_size):
+        await store.save_function_details(
+            name="repooled", image_uri=f"img@{pool_size}", handler="main.handle", runtime="python:3.11",
+            pool_size=pool_size, executor=executor.name,
+        )
+        await executor.release("repooled")
+        return await store.get_function_details("repooled")
+
+    async def main():
+        details = await deploy(pool_size=1)
+        pool = await executor.get_pool(details)
+        running = asyncio.create_task(executor.invoke(details, "block"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.invoke(details, "queued"))
+        await asyncio.sleep(0.01)
+        await deploy(pool_size=0)
+        pool.unblock.set()
+        await running
+        return await asyncio.wait_for(queued, 1)
+
+    assert asyncio.run(main()) == {"job": "queued"}
+
+
+@pytest.mark.parametrize("pool_size, pool_min_size", [(0, 0), (0, 2), (3, 0), (3, 3)])
+def test_pool_sizes_are_accepted(pool_size, pool_min_size):
+    _function(pool_size=pool_size, pool_min_size=pool_min_size)
+
+
+def test_min_size_above_pool_size_is_rejected():
+    with pytest.raises(ValidationError, match="pool_min_size"):
+        _function(pool_size=2, pool_min_size=3)
+
+
+def test_deploy_only_warms_pools_the_executor_uses(store, monkeypatch):
+    executor = JobOrPoolExecutor()
+    executors.register_executor(executor)
+    monkeypatch.setattr(settings, "default_executor", executor.name)
+
+    async def main():
+        try:
+            await orchestrator.deploy_new_function(_function(pool_min_size=1))
+            unpooled = list(executor._pools)
+            await orchestrator.deploy_new_function(_function(pool_size=2, pool_min_size=1))
+            return unpooled, list(executor._pools)
+        finally:
+            await executor.shutdown()
+            executors._executors.pop(executor.name, None)
+
+    unpooled, pooled = asyncio.run(main())
+    assert unpooled == []
+    assert pooled == ["sized"]
@@ -0,0 +1,64 @@
+import asyncio
+import io
+
+import pytest
+
+from radical_faas.runtime import protocol
+
+
+def _frame_bytes(kind, meta=None, body=b""):
+    return b"".join(protocol.frame_parts(kind, meta, body))
+
+
+async def _read_async(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return await protocol.read_frame_async(reader)
+
+
+@pytest.mark.parametrize("value", [{"a": [1, 2.5, None]}, "text", 0, None, b"\x00\xffraw"])
+def test_value_round_trip(value):
+    content_type, body = protocol.encode_value(value)
+    assert protocol.decode_value(content_type, body) == value
+
+
+def test_frames_round_trip_over_a_blocking_stream():
+    stream = io.BytesIO()
+    protocol.write_frame(stream, protocol.INVOKE, {"id": 1, "content_type": "json"}, b'{"x": 1}')
+    protocol.write_frame(stream, protocol.SHUTDOWN)
+    stream.seek(0)
+
+    assert protocol.read_frame(stream) == protocol.Frame(protocol.INVOKE, {"id": 1, "content_type": "json"}, b'{"x": 1}')
+    assert protocol.read_frame(stream) == protocol.Frame(protocol.SHUTDOWN, {}, b"")
+    assert protocol.read_frame(stream) is None
+
+
+def test_frames_round_trip_over_a_stream_reader():
+    body = bytes(range(256)) * 1024
+    frame = asyncio.run(_read_async(_frame_bytes(protocol.RESULT, {"id": 7}, body)))
+    assert frame == protocol.Frame(protocol.RESULT, {"id": 7}, body)
+
+
+def test_closed_stream_between_frames_reads_as_none():
+    assert protocol.read_frame(io.BytesIO()) is None
+    assert asyncio.run(_read_async(b"")) is None
+
+
+@pytest.mark.parametrize("cut", [1, protocol.HEADER.size, protocol.HEADER.size + 3, -1])
+def test_truncated_frame_is_a_protocol_error(cut):
+    data = _frame_bytes(protocol.RESULT, {"id": 1}, b"payload")[:cut]
+
+    with pytest.raises(protocol.ProtocolError):
+        protocol.read_frame(io.BytesIO(data))
+    with pytest.raises(protocol.ProtocolError):
+        asyncio.run(_read_async(data))
+
+
+def test_invalid_metadata_is_a_protocol_error():
+    data = protocol.HEADER.pack(protocol.RESULT, 3, 0) + b"{no"
+
+    with pytest.raises(protocol.ProtocolError):
+        protocol.read_frame(io.BytesIO(data))
+    with pytest.raises(protocol.ProtocolError):
+        asyncio.run(_read_async(data))
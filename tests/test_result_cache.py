@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from radical_faas.controller import result_cache
+from radical_faas.controller.result_cache import ResultCache, result_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "time", clock)
+    return clock
+
+
+def _runner(calls, value=None):
+    async def run():
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value
+    return run
+
+
+def test_result_key_depends_on_image_and_canonical_payload():
+    assert result_key("img@1", {"a": 1, "b": 2}) == result_key("img@1", {"b": 2, "a": 1})
+    assert result_key("img@1", {"a": 1}) != result_key("img@2", {"a": 1})
+    assert result_key("img@1", {"a": object()}) is None
+
+
+def test_fresh_results_are_reused_until_they_expire(clock):
+    async def main():
+        cache, calls = ResultCache(max_entries=10), []
+        await cache.get_or_run("k", 10, _runner(calls, 1))
+        clock.now += 9
+        await cache.get_or_run("k", 10, _runner(calls, 2))
+        clock.now += 2
+        latest = await cache.get_or_run("k", 10, _runner(calls, 3))
+        return cache, calls, latest
+
+    cache, calls, latest = asyncio.run(main())
+    assert calls == [1, 3]
+    assert latest == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_result_is_evicted(clock):
+    async def main():
+        cache, calls = ResultCache(max_entries=2), []
+        await cache.get_or_run("a", 60, _runner(calls, "a"))
+        await cache.get_or_run("b", 60, _runner(calls, "b"))
+        await cache.get_or_run("a", 60, _runner(calls, "a"))
+        await cache.get_or_run("c", 60, _runner(calls, "c"))
+        await cache.get_or_run("a", 60, _runner(calls, "a"))
+        await cache.get_or_run("b", 60, _runner(calls, "b"))
+        return cache, calls
+
+    cache, calls = asyncio.run(main())
+    assert calls == ["a", "b", "c", "b"]
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 2
+
+
+def test_concurrent_requests_share_one_run():
+    async def main():
+        cache, calls = ResultCache(max_entries=10), []
+        results = await asyncio.gather(*(cache.get_or_run("k", 60, _runner(calls, "v")) for _ in range(20)))
+        return cache, calls, results
+
+    cache, calls, results = asyncio.run(main())
+    assert calls == ["v"]
+    assert results == ["v"] * 20
+    assert (cache.misses, cache.coalesced) == (1, 19)
+
+
+def test_failed_run_is_shared_and_not_cached():
+    async def main():
+        cache, calls = ResultCache(max_entries=10), []
+
+        async def fail():
+            calls.append("fail")
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        outcomes = await asyncio.gather(*(cache.get_or_run("k", 60, fail) for _ in range(5)), return_exceptions=True)
+        retried = await cache.get_or_run("k", 60, _runner(calls, "ok"))
+        return calls, outcomes, retried
+
+    calls, outcomes, retried = asyncio.run(main())
+    assert calls == ["fail", "ok"]
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert retried == "ok"
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_run():
+    async def main():
+        cache, calls = ResultCache(max_entries=10), []
+
+        async def slow():
+            calls.append("run")
+            await asyncio.sleep(0.05)
+            return "v"
+
+        first = asyncio.create_task(cache.get_or_run("k", 60, slow))
+        second = asyncio.create_task(cache.get_or_run("k", 60, slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return calls, await second
+
+    assert asyncio.run(main()) == (["run"], "v")
+
+
+def test_evicted_results_are_spilled_with_their_expiry(store):
+    async def main():
+        cache, calls = ResultCache(max_entries=1, spill=True), []
+        await cache.get_or_run("spill-a", 60, _runner(calls, {"n": 1}))
+        expires_at = cache._entries["spill-a"][0]
+        await cache.get_or_run("spill-b", 60, _runner(calls, {"n": 2}))
+        while cache._spiller is not None:
+            await asyncio.sleep(0.01)
+        spilled = await store.get_cached_result("spill-a")
+        restored = await cache.get_or_run("spill-a", 600, _runner(calls, {"n": 3}))
+        return cache, calls, spilled, expires_at, restored
+
+    cache, calls, spilled, expires_at, restored = asyncio.run(main())
+    assert spilled == ('{"n": 1}', expires_at)
+    assert restored == {"n": 1}
+    assert calls == [{"n": 1}, {"n": 2}]
+    assert cache.spill_hits == 1
+    assert cache._entries["spill-a"][0] == expires_at